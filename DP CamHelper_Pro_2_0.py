@@ -13,58 +13,1714 @@ bl_info = {
 import bpy
 import math
 import os
-import wave
+import sys
 import array
+import bisect
+import hashlib
+import struct
 import math
+import random
+import threading
+import gpu
+import blf
+from itertools import accumulate
 from statistics import mean
-from mathutils import Vector, Matrix, Quaternion
+from mathutils import Vector, Matrix, Quaternion, kdtree
+from gpu_extras.batch import batch_for_shader
 from bpy.types import UIList
+from bpy.app.handlers import persistent
 from bpy.types import (Panel, Operator, PropertyGroup, Menu, AddonPreferences)
 from bpy.props import (FloatProperty, BoolProperty, IntProperty, 
                       EnumProperty, StringProperty, FloatVectorProperty, PointerProperty, CollectionProperty)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import aud
+except ImportError:
+    aud = None
 					  
 #utils/fonctions
-def analyze_audio_simple(file_path, chunk_size=2048, threshold=0.6):
-    with wave.open(file_path, 'rb') as wf:
-        n_channels = wf.getnchannels()
-        sampwidth = wf.getsampwidth()
-        framerate = wf.getframerate()
-        n_frames = wf.getnframes()
-        
-        # Read raw data
-        raw_data = wf.readframes(n_frames)
-        
-        # Convert raw data to array of integers
-        if sampwidth == 2:
-            data = array.array('h', raw_data)
+
+# Beat analysis engine
+#
+# The amplitude scan walks the track in half-window hops and jumps a whole
+# window after each detection. Window sums come from a cumulative sum of the
+# absolute samples, so every window costs O(1) whatever the chunk size.
+# Audio is read in fixed-size blocks and the walk resumes across block
+# boundaries, so memory stays bounded by the block size, not the track length.
+
+# Frames read from the WAV per block during analysis
+ANALYSIS_BLOCK_FRAMES = 65536
+
+def _scan_amplitude_python(samples, window_size, level, start=0):
+    # Prefix sums of |x| with a leading zero: window sum = cs[p + w] - cs[p]
+    cs = list(accumulate((abs(x) for x in samples), initial=0))
+    n = len(cs) - 1
+    hop = window_size // 2
+    positions = []
+    current_frame = start
+    
+    while current_frame < n - window_size:
+        amplitude = (cs[current_frame + window_size] - cs[current_frame]) / window_size
+        if amplitude > level:
+            positions.append(current_frame)
+            current_frame += window_size
+        else:
+            current_frame += hop
+            
+    return positions, current_frame
+
+def _scan_amplitude_numpy(samples, window_size, level, start=0):
+    # Same walk as _scan_amplitude_python over NumPy prefix sums
+    samples = np.asarray(samples)
+    n = len(samples)
+    hop = window_size // 2
+    
+    if n - window_size <= start:
+        return [], start
+    
+    cs = np.zeros(n + 1, dtype=np.int64 if samples.dtype.kind in 'iu' else np.float64)
+    np.cumsum(np.abs(samples.astype(cs.dtype)), out=cs[1:])
+    
+    positions = []
+    current_frame = start
+    while current_frame < n - window_size:
+        if (cs[current_frame + window_size] - cs[current_frame]) / window_size > level:
+            positions.append(current_frame)
+            current_frame += window_size
+        else:
+            current_frame += hop
+    return positions, current_frame
+
+def _window_means_python(samples, window_size):
+    # Mean |x| of every hop-grid window that ends before the last sample
+    cs = list(accumulate((abs(x) for x in samples), initial=0))
+    hop = window_size // 2
+    starts = range(0, len(samples) - window_size, hop)
+    return [(cs[p + window_size] - cs[p]) / window_size for p in starts]
+
+def _window_means_numpy(samples, window_size):
+    samples = np.asarray(samples)
+    hop = window_size // 2
+    starts = np.arange(0, len(samples) - window_size, hop)
+    cs = np.zeros(len(samples) + 1, dtype=np.int64 if samples.dtype.kind in 'iu' else np.float64)
+    np.cumsum(np.abs(samples.astype(cs.dtype)), out=cs[1:])
+    return (cs[starts + window_size] - cs[starts]) / window_size
+
+def _pick_amplitude_python(means, level):
+    hits = []
+    k = 0
+    while k < len(means):
+        if means[k] > level:
+            hits.append(k)
+            k += 2
         else:
-            data = array.array('i', raw_data)
+            k += 1
+    return hits
+
+def _pick_amplitude_numpy(means, level):
+    # A detection skips the next grid window, so inside each run of loud windows
+    # only every other one (counting from the start of the run) is a beat
+    loud = np.asarray(means) > level
+    idx = np.arange(len(loud))
+    run_start = np.where(loud & ~np.concatenate(([False], loud[:-1])), idx, 0)
+    np.maximum.accumulate(run_start, out=run_start)
+    return np.flatnonzero(loud & ((idx - run_start) % 2 == 0)).tolist()
+
+class AmplitudeScanner:
+    """Incremental amplitude beat scan fed with consecutive sample blocks"""
+    
+    # Decoded samples are normalized to [-1, 1]; raw 16-bit input uses 32767
+    def __init__(self, window_size, threshold, full_scale=1.0):
+        self.window_size = window_size
+        self.hop = window_size // 2
+        self.full_scale = full_scale
+        self.set_threshold(threshold)
+        # Even windows only ever land on the hop grid: keep every grid window's
+        # mean and pick beats at the end, which also lets the means be cached.
+        # Odd windows skip off the grid and are walked while reading.
+        self.on_grid = window_size == 2 * self.hop
+        self.positions = []
+        self._envelope = []
+        # Absolute index of the next window to test and of the first kept sample
+        self.position = 0
+        self.offset = 0
+        self._tail = np.zeros(0, dtype=np.int64) if np is not None else []
+        
+    def feed(self, block):
+        # Only the samples from the pending window onwards are carried over
+        if np is not None:
+            buf = np.concatenate((self._tail, np.asarray(block)))
+        else:
+            buf = list(self._tail)
+            buf.extend(block)
             
-        # Process only one channel if stereo
-        if n_channels == 2:
-            data = data[::2]
+        if self.on_grid:
+            if np is not None:
+                means = _window_means_numpy(buf, self.window_size)
+            else:
+                means = _window_means_python(buf, self.window_size)
+            self._envelope.append(means)
+            next_frame = len(means) * self.hop
+        elif np is not None:
+            positions, next_frame = _scan_amplitude_numpy(
+                buf, self.window_size, self.level, self.position - self.offset)
+            self.positions.extend(self.offset + p for p in positions)
+        else:
+            positions, next_frame = _scan_amplitude_python(
+                buf, self.window_size, self.level, self.position - self.offset)
+            self.positions.extend(self.offset + p for p in positions)
+        
+        keep_from = min(next_frame, len(buf))
+        self._tail = buf[keep_from:]
+        self.position = self.offset + next_frame
+        self.offset += keep_from
+        
+    def envelope(self):
+        # Mean |x| per hop-grid window, or None for odd windows
+        if not self.on_grid:
+            return None
+        if np is not None:
+            if not self._envelope:
+                return np.zeros(0, dtype=np.float64)
+            return np.concatenate(self._envelope)
+        return [mean for means in self._envelope for mean in means]
+        
+    def load_envelope(self, envelope):
+        self._envelope = [envelope]
+        
+    # What the analysis cache stores and restores
+    cache_data = envelope
+    load_cache_data = load_envelope
+        
+    def set_threshold(self, threshold):
+        self.threshold = threshold
+        self.level = threshold * self.full_scale
+        
+    def curve(self, framerate):
+        # Detection function compared against the threshold, one value per window
+        return np.asarray(self.envelope()) / self.full_scale
+        
+    def times(self, positions, framerate):
+        # Window start times in seconds
+        return np.asarray(positions) * self.hop / framerate
+        
+    def frames(self, framerate, fps):
+        if self.on_grid:
+            envelope = self.envelope()
+            if np is not None:
+                hits = _pick_amplitude_numpy(envelope, self.level)
+            else:
+                hits = _pick_amplitude_python(envelope, self.level)
+            self.positions = [k * self.hop for k in hits]
+        return [int(current_frame / framerate * fps) for current_frame in self.positions]
+
+# Spectral flux onsets: the summed positive change of the log-magnitude
+# spectrum between consecutive STFT frames, peak-picked against a running
+# median so loud masters and sustained tones do not trigger on level alone.
+
+# STFT hop as a fraction of the FFT size (chunk_size)
+FLUX_HOP_DIVISOR = 4
+# Log compression applied to magnitudes before differencing
+FLUX_COMPRESSION = 100.0
+# Adaptive threshold median window, peak neighbourhood and minimum onset spacing (seconds)
+FLUX_MEDIAN_SECONDS = 0.5
+FLUX_PEAK_SECONDS = 0.05
+FLUX_MIN_INTERVAL_SECONDS = 0.1
+# Rows of the strided median view processed at once
+FLUX_MEDIAN_ROWS = 16384
+# Drum bands that can be detected separately: (label, low Hz, high Hz).
+# Each band's flux is summed over its STFT bins, so every band comes from
+# the same FFT pass as the full-range onsets.
+ANALYSIS_BANDS = {
+    'KICK': ("Kick", 30.0, 150.0),
+    'SNARE': ("Snare", 200.0, 4000.0),
+    'HAT': ("Hat", 6000.0, 16000.0),
+}
+
+def _sliding_windows(values, size):
+    # Read-only (len - size + 1, size) view without copying
+    stride = values.strides[0]
+    return np.lib.stride_tricks.as_strided(
+        values, shape=(len(values) - size + 1, size), strides=(stride, stride), writeable=False)
+
+def _running_median(values, radius):
+    padded = np.pad(values, radius, mode='edge')
+    windows = _sliding_windows(padded, 2 * radius + 1)
+    result = np.empty(len(values), dtype=values.dtype)
+    for i in range(0, len(values), FLUX_MEDIAN_ROWS):
+        result[i:i + FLUX_MEDIAN_ROWS] = np.median(windows[i:i + FLUX_MEDIAN_ROWS], axis=1)
+    return result
+
+def onset_strength(envelope, frame_rate):
+    # Height above the running median in standard deviations, and the mask of
+    # local maxima; neither depends on the threshold
+    envelope = np.asarray(envelope, dtype=np.float64)
+    if len(envelope) == 0:
+        return envelope, np.zeros(0, dtype=bool)
+    
+    radius = max(1, int(round(FLUX_MEDIAN_SECONDS * frame_rate / 2)))
+    peak_radius = max(1, int(round(FLUX_PEAK_SECONDS * frame_rate)))
+    
+    baseline = _running_median(envelope, radius)
+    strength = (envelope - baseline) / max(envelope.std(), 1e-9)
+    
+    padded = np.pad(envelope, peak_radius, mode='constant', constant_values=-np.inf)
+    local_max = _sliding_windows(padded, 2 * peak_radius + 1).max(axis=1)
+    return strength, envelope >= local_max
+
+def select_onsets(strength, peaks, frame_rate, threshold=0.6):
+    # Local maxima above the threshold, at least the minimum interval apart
+    min_gap = max(1, int(round(FLUX_MIN_INTERVAL_SECONDS * frame_rate)))
+    candidates = np.flatnonzero(peaks & (strength > threshold))
+    
+    onsets = []
+    for idx in candidates.tolist():
+        if not onsets or idx - onsets[-1] >= min_gap:
+            onsets.append(idx)
+    return onsets
+
+class SpectralFluxScanner:
+    """Incremental spectral flux onset detector fed with consecutive sample blocks"""
+    
+    def __init__(self, fft_size, threshold, bands=()):
+        self.fft_size = fft_size
+        self.hop = max(1, fft_size // FLUX_HOP_DIVISOR)
+        self.threshold = threshold
+        self.bands = tuple(bands)
+        self.window = np.hanning(fft_size).astype(np.float32)
+        self._tail = np.zeros(0, dtype=np.float32)
+        self._previous = None
+        self._envelope = []
+        self._band_envelopes = [[] for band in self.bands]
+        self._band_bins = []
+        self._strength = None
+        self._band_strength = {}
+        
+    def start(self, framerate):
+        # STFT bin range of each band at this sample rate
+        freqs = np.fft.rfftfreq(self.fft_size, 1.0 / framerate)
+        self._band_bins = [
+            slice(int(np.searchsorted(freqs, ANALYSIS_BANDS[band][1])),
+                  int(np.searchsorted(freqs, ANALYSIS_BANDS[band][2])))
+            for band in self.bands
+        ]
+        
+    def feed(self, block):
+        block = np.asarray(block)
+        if block.dtype.kind in 'iu':
+            block = block.astype(np.float32) / np.iinfo(block.dtype).max
+        buf = np.concatenate((self._tail, block.astype(np.float32, copy=False)))
+        
+        count = (len(buf) - self.fft_size) // self.hop + 1
+        if count <= 0:
+            self._tail = buf
+            return
+        
+        # All complete frames of this block in one batched FFT
+        frames = _sliding_windows(buf, self.fft_size)[::self.hop][:count]
+        # Single precision throughout; NumPy before 2.0 transforms in double
+        # precision, which only the conversion back undoes
+        spectrum = np.abs(np.fft.rfft(frames * self.window, axis=1)).astype(np.float32, copy=False)
+        np.log1p(FLUX_COMPRESSION * spectrum, out=spectrum)
+        
+        if self._previous is None:
+            self._previous = spectrum[0]
+        diff = np.diff(spectrum, axis=0, prepend=self._previous[np.newaxis])
+        np.maximum(diff, 0.0, out=diff)
+        self._envelope.append(diff.sum(axis=1))
+        for envelope, bins in zip(self._band_envelopes, self._band_bins):
+            envelope.append(diff[:, bins].sum(axis=1))
+        self._strength = None
+        self._band_strength = {}
+        
+        self._previous = spectrum[-1]
+        self._tail = buf[count * self.hop:]
+        
+    def envelope(self):
+        if not self._envelope:
+            return np.zeros(0, dtype=np.float32)
+        return np.concatenate(self._envelope)
+        
+    def load_envelope(self, envelope):
+        self._envelope = [envelope]
+        self._strength = None
+        
+    def band_envelope(self, index):
+        if not self._band_envelopes[index]:
+            return np.zeros(0, dtype=np.float32)
+        return np.concatenate(self._band_envelopes[index])
+        
+    def cache_data(self):
+        # Full-range envelope, followed by one row per band
+        if not self.bands:
+            return self.envelope()
+        return np.vstack([self.envelope()] + [self.band_envelope(i) for i in range(len(self.bands))])
+        
+    def load_cache_data(self, data):
+        if data.ndim == 1:
+            self.load_envelope(data)
+            return
+        self.load_envelope(data[0])
+        self._band_envelopes = [[row] for row in data[1:]]
+        self._band_strength = {}
+        
+    def set_threshold(self, threshold):
+        self.threshold = threshold
+        
+    def onset_strength(self, framerate):
+        # Computed once, so changing the threshold only redoes the selection
+        if self._strength is None:
+            self._strength = onset_strength(self.envelope(), framerate / self.hop)
+        return self._strength
+        
+    def curve(self, framerate):
+        return self.onset_strength(framerate)[0]
+        
+    def times(self, positions, framerate):
+        # Analysis frame centre times in seconds
+        return (np.asarray(positions) * self.hop + self.fft_size // 2) / framerate
+        
+    def frame_at(self, position, framerate, fps):
+        # Scene frame at the centre of an (possibly fractional) analysis frame
+        return int((position * self.hop + self.fft_size // 2) / framerate * fps)
+        
+    def frames(self, framerate, fps):
+        strength, peaks = self.onset_strength(framerate)
+        onsets = select_onsets(strength, peaks, framerate / self.hop, self.threshold)
+        return [self.frame_at(i, framerate, fps) for i in onsets]
+        
+    def band_frames(self, framerate, fps):
+        # [(band id, onset frames)] for every analysed band
+        frame_rate = framerate / self.hop
+        result = []
+        for index, band in enumerate(self.bands):
+            if band not in self._band_strength:
+                self._band_strength[band] = onset_strength(self.band_envelope(index), frame_rate)
+            strength, peaks = self._band_strength[band]
+            onsets = select_onsets(strength, peaks, frame_rate, self.threshold)
+            result.append((band, [self.frame_at(i, framerate, fps) for i in onsets]))
+        return result
+        
+    def grid(self, framerate, fps, beats_per_bar=4, min_bpm=60.0, max_bpm=180.0):
+        # Beat grid markers as (bar, beat, frame), plus the estimated BPM
+        envelope = self.envelope()
+        frame_rate = framerate / self.hop
+        period = estimate_tempo(envelope, frame_rate, min_bpm, max_bpm)
+        if period is None:
+            return [], None
         
-        # Find beats
-        beats = []
-        current_frame = 0
-        window_size = chunk_size
+        markers = [(bar, beat, self.frame_at(position, framerate, fps))
+                   for position, bar, beat in beat_grid(envelope, period, beats_per_bar)]
+        return markers, 60.0 * frame_rate / period
+
+# Tempo and beat grid: autocorrelation of the onset envelope gives the beat
+# period, the grid phase is the offset collecting the most onset energy, and
+# the bar phase is the beat slot with the strongest average onset.
+
+# Log-normal tempo prior that resolves half/double tempo ambiguity
+TEMPO_PRIOR_BPM = 120.0
+TEMPO_PRIOR_OCTAVES = 1.0
+
+def estimate_tempo(envelope, frame_rate, min_bpm=60.0, max_bpm=180.0):
+    # Beat period in envelope frames, or None if the track is too short
+    envelope = np.asarray(envelope, dtype=np.float64)
+    n = len(envelope)
+    min_lag = max(1, int(math.floor(60.0 * frame_rate / max_bpm)))
+    max_lag = min(n - 1, int(math.ceil(60.0 * frame_rate / min_bpm)))
+    if max_lag <= min_lag:
+        return None
+    
+    # Autocorrelation through a zero-padded FFT
+    centered = envelope - envelope.mean()
+    size = 1 << (2 * n - 1).bit_length()
+    spectrum = np.fft.rfft(centered, size)
+    autocorr = np.fft.irfft(spectrum * np.conj(spectrum), size)[:n]
+    
+    lags = np.arange(min_lag, max_lag + 1)
+    prior = np.exp(-0.5 * (np.log2(60.0 * frame_rate / lags / TEMPO_PRIOR_BPM) / TEMPO_PRIOR_OCTAVES) ** 2)
+    score = autocorr[lags] * prior
+    best = int(np.argmax(score))
+    period = float(lags[best])
+    
+    # Parabolic interpolation for a sub-frame period
+    if 0 < best < len(lags) - 1:
+        a, b, c = score[best - 1], score[best], score[best + 1]
+        denom = a - 2.0 * b + c
+        if denom != 0.0:
+            period += 0.5 * (a - c) / denom
+    return period
+
+def beat_grid(envelope, period, beats_per_bar=4):
+    # (envelope position, bar, beat) for every beat of a constant-tempo grid
+    envelope = np.asarray(envelope, dtype=np.float64)
+    n = len(envelope)
+    steps = np.arange(int(n / period) + 1) * period
+    
+    # Score every candidate phase in one gather
+    phases = np.arange(max(1, int(math.ceil(period))))
+    idx = np.rint(phases[:, np.newaxis] + steps[np.newaxis, :]).astype(np.int64)
+    score = np.where(idx < n, envelope[np.minimum(idx, n - 1)], 0.0).sum(axis=1)
+    positions = phases[int(np.argmax(score))] + steps
+    positions = positions[np.rint(positions) < n]
+    
+    # Downbeat is the bar slot with the strongest onsets on average
+    strengths = envelope[np.rint(positions).astype(np.int64)]
+    slots = [strengths[b::beats_per_bar].mean() if len(strengths[b::beats_per_bar]) else 0.0
+             for b in range(beats_per_bar)]
+    first = int(np.argmax(slots))
+    
+    grid = []
+    for k, position in enumerate(positions.tolist()):
+        bar, beat = divmod(k - first, beats_per_bar)
+        grid.append((position, bar + 1, beat + 1))
+    return grid
+
+# Analysis cache: the per-window envelope of each analysed file is stored in
+# a small binary file keyed by the file identity and the settings that shape
+# the envelope. Threshold and marker settings only affect peak picking, so
+# changing them re-uses the cached envelope instead of decoding again.
+
+AUDIO_CACHE_VERSION = 3
+AUDIO_CACHE_MAX_BYTES = 256 * 1024 * 1024
+AUDIO_CACHE_EXTENSION = ".dpbeat"
+# magic, format version, envelope type code, sample rate, value count, envelope rows
+_AUDIO_CACHE_HEADER = struct.Struct('<6sHcIQH')
+_AUDIO_CACHE_MAGIC = b'DPBEAT'
+
+def audio_cache_dir():
+    return bpy.utils.user_resource('DATAFILES', path=os.path.join("dp_camhelper", "audio_cache"), create=True)
+
+def audio_cache_path(cache_dir, file_path, kind, chunk_size, variant=""):
+    stat = os.stat(file_path)
+    key = "|".join(str(part) for part in (
+        AUDIO_CACHE_VERSION, os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, kind, chunk_size, variant))
+    return os.path.join(cache_dir, hashlib.sha1(key.encode('utf-8')).hexdigest() + AUDIO_CACHE_EXTENSION)
+
+def load_cached_envelope(path):
+    # (envelope, sample rate), or None on a miss or an unreadable entry
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(_AUDIO_CACHE_HEADER.size)
+            payload = f.read()
+        magic, version, typecode, framerate, count, rows = _AUDIO_CACHE_HEADER.unpack(header)
+    except (OSError, struct.error):
+        return None
+    
+    typecode = typecode.decode('ascii')
+    if magic != _AUDIO_CACHE_MAGIC or version != AUDIO_CACHE_VERSION:
+        return None
+    if len(payload) != count * struct.calcsize(typecode):
+        return None
+    
+    # Touch the entry so eviction drops the least recently used files first
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    
+    if np is not None:
+        envelope = np.frombuffer(payload, dtype='<' + typecode)
+        return (envelope.reshape(rows, -1) if rows > 1 else envelope), framerate
+    return array.array(typecode, payload), framerate
+
+def store_cached_envelope(path, envelope, framerate):
+    # Envelopes with several rows (per-band analysis) are stored row after row
+    rows = 1
+    if np is not None:
+        envelope = np.asarray(envelope)
+        rows = envelope.shape[0] if envelope.ndim == 2 else 1
+        typecode = 'f' if envelope.dtype == np.float32 else 'd'
+        payload = envelope.astype('<' + typecode).tobytes()
+    else:
+        typecode = 'd'
+        payload = array.array(typecode, envelope).tobytes()
         
-        while current_frame < len(data) - window_size:
-            window = data[current_frame:current_frame + window_size]
+    header = _AUDIO_CACHE_HEADER.pack(
+        _AUDIO_CACHE_MAGIC, AUDIO_CACHE_VERSION, typecode.encode('ascii'), framerate,
+        len(payload) // struct.calcsize(typecode), rows)
+    
+    # Write then rename so a concurrent reader never sees a partial entry
+    temp_path = path + ".tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(header)
+        f.write(payload)
+    os.replace(temp_path, path)
+    
+    evict_audio_cache(os.path.dirname(path))
+
+def evict_audio_cache(cache_dir, max_bytes=AUDIO_CACHE_MAX_BYTES):
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(AUDIO_CACHE_EXTENSION) and entry.is_file():
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
             
-            # Calculate amplitude
-            amplitude = sum(abs(x) for x in window) / window_size
+    total = sum(size for mtime, size, path in entries)
+    for mtime, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+# Audio decoders: every supported format is read block by block into float32
+# frames normalized to [-1, 1], shaped (frames, channels). WAV is parsed
+# directly so 8/24-bit, float, WAVE_FORMAT_EXTENSIBLE and RF64 files stream
+# from disk; other formats go through Blender's aud module.
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+WAVE_EXTENSIONS = {'.wav', '.wave'}
+AUD_EXTENSIONS = {'.mp3', '.ogg', '.oga', '.flac', '.aac', '.m4a', '.opus', '.aif', '.aiff', '.mp2', '.ac3'}
+
+def _decode_pcm_numpy(raw, sample_format, sampwidth, channels):
+    if sample_format == WAVE_FORMAT_IEEE_FLOAT:
+        data = np.frombuffer(raw, dtype='<f4' if sampwidth == 4 else '<f8').astype(np.float32)
+    elif sampwidth == 1:
+        # 8-bit PCM is unsigned
+        data = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif sampwidth == 2:
+        data = np.frombuffer(raw, dtype='<i2').astype(np.float32) / 32768.0
+    elif sampwidth == 3:
+        # Put the three bytes at the top of an int32, then shift back down to sign-extend
+        packed = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3)
+        wide = np.zeros((len(packed), 4), dtype=np.uint8)
+        wide[:, 1:] = packed
+        data = (wide.view('<i4')[:, 0] >> 8).astype(np.float32) / 8388608.0
+    else:
+        data = np.frombuffer(raw, dtype='<i4').astype(np.float32) / 2147483648.0
+    return data.reshape(-1, channels)
+
+def _decode_pcm_python(raw, sample_format, sampwidth, channels):
+    # Channel-major lists of floats when NumPy is unavailable
+    if sample_format == WAVE_FORMAT_IEEE_FLOAT:
+        values, scale = array.array('f' if sampwidth == 4 else 'd', raw), 1.0
+    elif sampwidth == 1:
+        values, scale = [x - 128 for x in raw], 128.0
+    elif sampwidth == 2:
+        values, scale = array.array('h', raw), 32768.0
+    elif sampwidth == 3:
+        values = [int.from_bytes(raw[i:i + 3], 'little', signed=True) for i in range(0, len(raw), 3)]
+        scale = 8388608.0
+    else:
+        values, scale = array.array('i', raw), 2147483648.0
+        
+    if isinstance(values, array.array) and sys.byteorder == 'big':
+        values.byteswap()
+    return [[x / scale for x in values[c::channels]] for c in range(channels)]
+
+class WaveDecoder:
+    """Streaming reader for PCM (8/16/24/32-bit) and IEEE float WAV files"""
+    
+    def __init__(self, file_path):
+        self._file = open(file_path, 'rb')
+        try:
+            self._read_header()
+        except Exception:
+            self._file.close()
+            raise
+        self.position = 0
+        
+    def _read_header(self):
+        f = self._file
+        riff, riff_size, form = struct.unpack('<4sI4s', f.read(12))
+        if riff not in (b'RIFF', b'RF64') or form != b'WAVE':
+            raise ValueError("Not a WAV file")
+        
+        fmt = None
+        data_size_64 = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError("WAV file has no data chunk")
+            chunk_id, chunk_size = struct.unpack('<4sI', header)
             
-            # If amplitude exceeds threshold, mark as beat
-            if amplitude > threshold * 32767:  # 32767 is max value for 16-bit audio
-                frame_time = current_frame / framerate
-                frame_number = int(frame_time * bpy.context.scene.render.fps)
-                beats.append(frame_number)
-                current_frame += window_size  # Skip to avoid multiple detections
-            else:
-                current_frame += window_size // 2
+            if chunk_id == b'data':
+                break
+            
+            body = f.read(chunk_size + (chunk_size & 1))
+            if chunk_id == b'fmt ':
+                sample_format, channels, framerate, byte_rate, block_align, bits = struct.unpack_from('<HHIIHH', body)
+                # The real format of WAVE_FORMAT_EXTENSIBLE is the start of its sub-format GUID
+                if sample_format == WAVE_FORMAT_EXTENSIBLE and chunk_size >= 40:
+                    sample_format = struct.unpack_from('<H', body, 24)[0]
+                fmt = (sample_format, channels, framerate, block_align)
+            elif chunk_id == b'ds64':
+                # RF64 keeps the real data size here when it exceeds 32 bits
+                data_size_64 = struct.unpack_from('<Q', body, 8)[0]
                 
-        return beats
+        if fmt is None:
+            raise ValueError("WAV data chunk comes before its fmt chunk")
+        
+        sample_format, channels, framerate, block_align = fmt
+        sampwidth = block_align // max(channels, 1)
+        if sample_format == WAVE_FORMAT_PCM and sampwidth in (1, 2, 3, 4):
+            pass
+        elif sample_format == WAVE_FORMAT_IEEE_FLOAT and sampwidth in (4, 8):
+            pass
+        else:
+            raise ValueError(f"Unsupported WAV encoding (format {sample_format:#06x}, {sampwidth * 8}-bit)")
+        
+        if chunk_size == 0xFFFFFFFF and data_size_64 is not None:
+            chunk_size = data_size_64
+        
+        # Clamp to the file so truncated or still-growing recordings can be read
+        data_start = f.tell()
+        available = os.fstat(f.fileno()).st_size - data_start
+        
+        self.sample_format = sample_format
+        self.channels = channels
+        self.framerate = framerate
+        self.sampwidth = sampwidth
+        self.block_align = block_align
+        self.frames = min(chunk_size, available) // block_align
+        
+    def blocks(self, block_frames=ANALYSIS_BLOCK_FRAMES):
+        decode = _decode_pcm_numpy if np is not None else _decode_pcm_python
+        while self.position < self.frames:
+            count = min(block_frames, self.frames - self.position)
+            raw = self._file.read(count * self.block_align)
+            count = len(raw) // self.block_align
+            if count == 0:
+                break
+            self.position += count
+            yield decode(raw[:count * self.block_align], self.sample_format, self.sampwidth, self.channels)
+            
+    def close(self):
+        self._file.close()
+        
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+class AudDecoder:
+    """Compressed formats decoded through Blender's aud module"""
+    
+    def __init__(self, file_path):
+        if aud is None or np is None:
+            raise RuntimeError("This audio format needs Blender's aud module")
+        sound = aud.Sound(file_path)
+        self.framerate = int(sound.specs[0])
+        self.channels = int(sound.specs[1])
+        # aud decodes the whole file at once; blocks are views into it
+        self._data = np.asarray(sound.data(), dtype=np.float32).reshape(-1, self.channels)
+        self.frames = len(self._data)
+        self.position = 0
+        
+    def blocks(self, block_frames=ANALYSIS_BLOCK_FRAMES):
+        while self.position < self.frames:
+            block = self._data[self.position:self.position + block_frames]
+            self.position += len(block)
+            yield block
+            
+    def close(self):
+        self._data = None
+        
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+def is_supported_audio(file_path):
+    extension = os.path.splitext(file_path)[1].lower()
+    return extension in WAVE_EXTENSIONS or (aud is not None and extension in AUD_EXTENSIONS)
+
+def open_audio_decoder(file_path):
+    if os.path.splitext(file_path)[1].lower() in WAVE_EXTENSIONS:
+        try:
+            return WaveDecoder(file_path)
+        except ValueError:
+            # Compressed WAV encodings are left to aud
+            if aud is None:
+                raise
+    return AudDecoder(file_path)
+
+def analysis_downmix(mode, use_flux):
+    # RMS rectifies the signal, which only the amplitude scanner can use
+    return 'MEAN' if use_flux and mode == 'RMS' else mode
+
+def downmix(block, mode='MEAN'):
+    # One analysis channel from a (frames, channels) block, or from
+    # channel-major lists when NumPy is unavailable
+    if np is not None:
+        if mode == 'FIRST' or block.shape[1] == 1:
+            return block[:, 0]
+        if mode == 'RMS':
+            return np.sqrt(np.mean(np.square(block), axis=1))
+        return block.mean(axis=1)
+    
+    if mode == 'FIRST' or len(block) == 1:
+        return block[0]
+    count = len(block)
+    if mode == 'RMS':
+        return [math.sqrt(sum(x * x for x in frame) / count) for frame in zip(*block)]
+    return [sum(frame) / count for frame in zip(*block)]
+
+def _watch_blocks(decoder, block_frames, progress=None, cancel=None):
+    # Report the fraction of the file read and stop early once cancelled
+    n_frames = max(decoder.frames, 1)
+    for block in decoder.blocks(block_frames):
+        if cancel is not None and cancel.is_set():
+            return
+        yield block
+        if progress is not None:
+            progress(min(decoder.position / n_frames, 1.0))
+
+def scan_audio(file_path, chunk_size=2048, threshold=0.6, mode='AMPLITUDE', use_grid=False,
+               downmix_mode='MEAN', bands=(), cache_dir=None, block_frames=ANALYSIS_BLOCK_FRAMES,
+               progress=None, cancel=None):
+    # Decode the file once into a scanner holding the analysis, and its sample rate
+    use_flux = mode == 'SPECTRAL_FLUX' or use_grid or bool(bands)
+    if use_flux and np is None:
+        raise RuntimeError("Spectral flux, band and tempo analysis require NumPy")
+    downmix_mode = analysis_downmix(downmix_mode, use_flux)
+    
+    if use_flux:
+        kind = 'SPECTRAL_FLUX'
+        scanner = SpectralFluxScanner(chunk_size, threshold, bands)
+    else:
+        kind = 'AMPLITUDE'
+        scanner = AmplitudeScanner(chunk_size, threshold)
+        
+    # Odd amplitude windows are walked while reading and have no envelope to cache
+    cache_path = None
+    if cache_dir is not None and (kind != 'AMPLITUDE' or scanner.on_grid):
+        variant = f"{downmix_mode}|{','.join(bands)}"
+        cache_path = audio_cache_path(cache_dir, file_path, kind, chunk_size, variant)
+    
+    cached = load_cached_envelope(cache_path) if cache_path else None
+    if cached is not None:
+        data, framerate = cached
+        scanner.load_cache_data(data)
+        if progress is not None:
+            progress(1.0)
+        return scanner, framerate
+    
+    with open_audio_decoder(file_path) as decoder:
+        framerate = decoder.framerate
+        if use_flux:
+            scanner.start(framerate)
+        for block in _watch_blocks(decoder, block_frames, progress, cancel):
+            scanner.feed(downmix(block, downmix_mode))
+        
+    if cache_path and not (cancel is not None and cancel.is_set()):
+        try:
+            store_cached_envelope(cache_path, scanner.cache_data(), framerate)
+        except OSError:
+            pass
+    return scanner, framerate
+
+def beat_markers(scanner, framerate, fps, marker_mode='ONSETS', beats_per_bar=4, min_bpm=60.0, max_bpm=180.0):
+    # ([(marker label, frame)], estimated BPM or None)
+    if marker_mode not in {'BEATS', 'BARS'}:
+        if getattr(scanner, 'bands', ()):
+            # Band onsets are tagged with the band, e.g. Kick_12
+            return [(f"{ANALYSIS_BANDS[band][0]}_{i + 1}", frame)
+                    for band, frames in scanner.band_frames(framerate, fps)
+                    for i, frame in enumerate(frames)], None
+        return [(str(i + 1), frame) for i, frame in enumerate(scanner.frames(framerate, fps))], None
+    
+    grid, bpm = scanner.grid(framerate, fps, beats_per_bar, min_bpm, max_bpm)
+    if marker_mode == 'BARS':
+        return [(str(bar), frame) for bar, beat, frame in grid if beat == 1], bpm
+    return [(f"{bar}.{beat}", frame) for bar, beat, frame in grid], bpm
+
+def analyze_audio(file_path, chunk_size=2048, threshold=0.6, fps=None, mode='AMPLITUDE',
+                  marker_mode='ONSETS', beats_per_bar=4, min_bpm=60.0, max_bpm=180.0,
+                  downmix_mode='MEAN', bands=(), cache_dir=None,
+                  block_frames=ANALYSIS_BLOCK_FRAMES, progress=None, cancel=None):
+    # Decode the file once and return ([(marker label, frame)], estimated BPM or None).
+    # The operator runs scan_audio and beat_markers itself; this is the
+    # blocking entry point for scripts.
+    if fps is None:
+        fps = bpy.context.scene.render.fps
+        
+    scanner, framerate = scan_audio(
+        file_path,
+        chunk_size=chunk_size,
+        threshold=threshold,
+        mode=mode,
+        use_grid=marker_mode in {'BEATS', 'BARS'},
+        downmix_mode=downmix_mode,
+        bands=bands,
+        cache_dir=cache_dir,
+        block_frames=block_frames,
+        progress=progress,
+        cancel=cancel
+    )
+    return beat_markers(scanner, framerate, fps, marker_mode, beats_per_bar, min_bpm, max_bpm)
+
+def analyze_audio_simple(file_path, chunk_size=2048, threshold=0.6, fps=None, mode='AMPLITUDE',
+                         block_frames=ANALYSIS_BLOCK_FRAMES, progress=None, cancel=None):
+    # Compatibility with scripts written against the original helper: onset
+    # frames only, no labels or tempo
+    markers, bpm = analyze_audio(
+        file_path,
+        chunk_size=chunk_size,
+        threshold=threshold,
+        fps=fps,
+        mode=mode,
+        block_frames=block_frames,
+        progress=progress,
+        cancel=cancel
+    )
+    return [frame for label, frame in markers]
+		
+def sync_beat_markers(timeline_markers, prefix, markers, remove_stale=True):
+    # Make the prefixed timeline markers match [(label, frame)] by moving
+    # markers that already exist, adding the missing ones and, when
+    # remove_stale is set, removing the rest. Returns (added, moved, removed).
+    wanted = {f"{prefix}{label}": frame for label, frame in markers}
+    
+    existing = {}
+    stale = []
+    for marker in timeline_markers:
+        if not marker.name.startswith(prefix):
+            continue
+        if marker.name in wanted and marker.name not in existing:
+            existing[marker.name] = marker
+        else:
+            stale.append(marker)
+            
+    moved = 0
+    for name, marker in existing.items():
+        if marker.frame != wanted[name]:
+            marker.frame = wanted[name]
+            moved += 1
+            
+    # Removal happens after iterating so no marker is skipped
+    removed = 0
+    if remove_stale:
+        for marker in stale:
+            timeline_markers.remove(marker)
+        removed = len(stale)
+        
+    added = 0
+    for name, frame in wanted.items():
+        if name not in existing:
+            timeline_markers.new(name, frame=frame)
+            added += 1
+            
+    return added, moved, removed
+
+# Threshold preview: the last analysis stays in memory and is drawn in the
+# timeline as its detection curve, the threshold line and the beats the
+# current threshold would produce. Moving the threshold only re-runs the
+# per-window beat selection.
+
+# Curve points kept for drawing, whatever the track length
+PREVIEW_POINTS = 4096
+# Fraction of the timeline height used by the preview
+PREVIEW_HEIGHT = 0.6
+PREVIEW_CURVE_COLOR = (0.3, 0.7, 1.0, 0.8)
+PREVIEW_THRESHOLD_COLOR = (1.0, 0.45, 0.2, 0.9)
+PREVIEW_BEAT_COLOR = (1.0, 1.0, 1.0, 0.35)
+
+_beat_preview = {}
+
+def beat_preview_key(file_path, chunk_size, mode, marker_mode, downmix_mode, bands):
+    kind = 'SPECTRAL_FLUX' if mode == 'SPECTRAL_FLUX' or marker_mode != 'ONSETS' or bands else 'AMPLITUDE'
+    return (file_path, chunk_size, kind, analysis_downmix(downmix_mode, kind == 'SPECTRAL_FLUX'), tuple(bands))
+
+def selected_bands(props):
+    # Band ids to analyse, in ANALYSIS_BANDS order
+    if not props.use_bands:
+        return ()
+    return tuple(band for band in ANALYSIS_BANDS if band in props.analysis_bands)
+
+def current_beat_preview(props):
+    # The stored preview if it was made with the panel's current settings
+    preview = _beat_preview.get('current')
+    key = beat_preview_key(bpy.path.abspath(props.audio_file), props.chunk_size,
+                           props.detection_mode, props.marker_mode, props.downmix_mode, selected_bands(props))
+    if preview is None or preview.key != key:
+        return None
+    return preview
+
+class BeatPreview:
+    """Analysis kept in memory to preview beats while the threshold changes"""
+    
+    def __init__(self, scanner, framerate, fps, key):
+        self.scanner = scanner
+        self.framerate = framerate
+        self.fps = fps
+        self.key = key
+        
+        # Max-pool the detection curve down to at most PREVIEW_POINTS
+        curve = np.asarray(scanner.curve(framerate), dtype=np.float32)
+        step = max(1, -(-len(curve) // PREVIEW_POINTS))
+        count = -(-len(curve) // step)
+        pooled = np.full(count * step, -np.inf, dtype=np.float32)
+        pooled[:len(curve)] = curve
+        self.values = np.maximum(pooled.reshape(count, step).max(axis=1), 0.0)
+        self.x = scanner.times(np.arange(count) * step, framerate) * fps
+        self.peak = max(float(self.values.max()) if count else 0.0, 1.0)
+        
+        self._batches = {}
+        self.set_threshold(scanner.threshold)
+        
+    def set_threshold(self, threshold):
+        self.scanner.set_threshold(threshold)
+        self.beat_frames = self.scanner.frames(self.framerate, self.fps)
+        self._batches.pop('threshold', None)
+        self._batches.pop('beats', None)
+        
+    def batches(self, shader):
+        # (batch, color) pairs, built lazily and kept until the threshold moves
+        if 'curve' not in self._batches:
+            coords = np.column_stack((self.x, self.values)).astype(np.float32)
+            self._batches['curve'] = batch_for_shader(shader, 'LINE_STRIP', {"pos": coords})
+        if 'threshold' not in self._batches:
+            end = float(self.x[-1]) if len(self.x) else 0.0
+            threshold = self.scanner.threshold
+            self._batches['threshold'] = batch_for_shader(
+                shader, 'LINES', {"pos": [(0.0, threshold), (end, threshold)]})
+        if 'beats' not in self._batches:
+            coords = [(frame, y) for frame in self.beat_frames for y in (0.0, self.peak)]
+            self._batches['beats'] = batch_for_shader(shader, 'LINES', {"pos": coords})
+        return (
+            (self._batches['beats'], PREVIEW_BEAT_COLOR),
+            (self._batches['curve'], PREVIEW_CURVE_COLOR),
+            (self._batches['threshold'], PREVIEW_THRESHOLD_COLOR),
+        )
+
+def uniform_color_shader_2d():
+    # Blender 4.0 dropped the 2D_/3D_ prefixed builtin shader names
+    try:
+        return gpu.shader.from_builtin('2D_UNIFORM_COLOR')
+    except ValueError:
+        return gpu.shader.from_builtin('UNIFORM_COLOR')
+
+def uniform_color_shader_3d():
+    try:
+        return gpu.shader.from_builtin('3D_UNIFORM_COLOR')
+    except ValueError:
+        return gpu.shader.from_builtin('UNIFORM_COLOR')
+
+def tag_redraw_areas(context, area_types):
+    for window in context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type in area_types:
+                area.tag_redraw()
+
+def update_beat_preview(self, context):
+    preview = current_beat_preview(self)
+    if preview is not None:
+        preview.set_threshold(self.threshold)
+    tag_redraw_areas(context, {'DOPESHEET_EDITOR', 'VIEW_3D'})
+
+def draw_beat_preview():
+    context = bpy.context
+    if context.space_data.mode != 'TIMELINE':
+        return
+    
+    props = context.scene.beat_analyzer_props
+    preview = current_beat_preview(props) if props.show_preview else None
+    if preview is None:
+        return
+    
+    # Batches are in (frame, value) units; map values onto the lower part of the region
+    view2d = context.region.view2d
+    y_bottom = view2d.region_to_view(0, 0)[1]
+    y_top = view2d.region_to_view(0, context.region.height)[1]
+    
+    shader = uniform_color_shader_2d()
+    gpu.state.blend_set('ALPHA')
+    gpu.matrix.push()
+    gpu.matrix.translate((0.0, y_bottom))
+    gpu.matrix.scale((1.0, (y_top - y_bottom) * PREVIEW_HEIGHT / preview.peak))
+    
+    shader.bind()
+    for batch, color in preview.batches(shader):
+        shader.uniform_float("color", color)
+        batch.draw(shader)
+        
+    gpu.matrix.pop()
+    gpu.state.blend_set('NONE')
+		
+# Camera shake: offsets for the whole frame range are computed up front and
+# written straight into the F-Curves, so the scene is never re-evaluated per
+# frame and the current frame does not change.
+
+# Animated channels of a shake: location, then rotation
+SHAKE_CHANNELS = (
+    ("location", 0), ("location", 1), ("location", 2),
+    ("rotation_euler", 0), ("rotation_euler", 1), ("rotation_euler", 2)
+)
+
+# Lattice size of the gradient noise, the noise repeats after this many units
+NOISE_LATTICE = 256
+# Frequency and amplitude ratios between successive noise octaves
+NOISE_LACUNARITY = 2.0
+NOISE_GAIN = 0.5
+
+def noise_gradients(seed, channel):
+    # Lattice gradients for one channel. random.Random gives the same
+    # sequence on every platform, so render nodes get identical shake.
+    rng = random.Random(seed * len(SHAKE_CHANNELS) + channel)
+    return [rng.uniform(-1.0, 1.0) for _ in range(NOISE_LATTICE)]
+
+def _gradient_noise_python(t, gradients):
+    i = math.floor(t)
+    f = t - i
+    g0 = gradients[i % NOISE_LATTICE] * f
+    g1 = gradients[(i + 1) % NOISE_LATTICE] * (f - 1.0)
+    u = f * f * f * (f * (f * 6.0 - 15.0) + 10.0)
+    return 2.0 * (g0 + u * (g1 - g0))
+
+def _gradient_noise_numpy(t, gradients):
+    i = np.floor(t)
+    f = t - i
+    i = i.astype(np.int64) % NOISE_LATTICE
+    g0 = gradients[..., i] * f
+    g1 = gradients[..., (i + 1) % NOISE_LATTICE] * (f - 1.0)
+    u = f * f * f * (f * (f * 6.0 - 15.0) + 10.0)
+    return 2.0 * (g0 + u * (g1 - g0))
+
+def fractal_noise(t, gradients, octaves=1):
+    # Multi-octave gradient noise in [-1, 1]. t is a float or, with NumPy,
+    # an array of sample positions that is evaluated in one batch. With a 2D
+    # array of gradients every row is sampled at once, one output row each.
+    numpy = np is not None and isinstance(t, np.ndarray)
+    if numpy:
+        gradients = np.asarray(gradients, dtype=np.float64)
+    total = 0.0
+    norm = 0.0
+    frequency = 1.0
+    amplitude = 1.0
+    for octave in range(max(octaves, 1)):
+        # Shift each octave so their lattice points do not line up
+        sample = t * frequency + octave * 31.7
+        if numpy:
+            total = total + amplitude * _gradient_noise_numpy(sample, gradients)
+        else:
+            total += amplitude * _gradient_noise_python(sample, gradients)
+        norm += amplitude
+        frequency *= NOISE_LACUNARITY
+        amplitude *= NOISE_GAIN
+    return total / norm
+
+def shake_offsets_batch(noise_type, count, rows, frequency, decay, octaves=1):
+    # Offsets for count frames, one sequence per (seed, channel, amplitude)
+    # row. All rows are computed together, so shaking many cameras costs
+    # about the same as shaking one. The same seed and channel always give
+    # the same offsets.
+    if count <= 0:
+        return [[] for _ in rows]
+    
+    if noise_type == 'RANDOM':
+        rngs = [random.Random(seed * len(SHAKE_CHANNELS) + channel) for seed, channel, _ in rows]
+        noise = [[rng.uniform(-1.0, 1.0) for _ in range(count)] for rng in rngs]
+    
+    if np is not None:
+        frame = np.arange(count, dtype=np.float64)
+        fade = 1.0 - (frame / count) * decay
+        t = frame * frequency
+        amplitudes = np.array([amplitude for _, _, amplitude in rows], dtype=np.float64)[:, None]
+        if noise_type == 'PERLIN':
+            gradients = np.array([noise_gradients(seed, channel) for seed, channel, _ in rows])
+            values = fractal_noise(t, gradients, octaves)
+        elif noise_type == 'RANDOM':
+            values = np.array(noise)
+        else:  # SINE
+            waves = np.vstack((np.sin(t), np.cos(t), np.sin(t * 0.5)))
+            values = waves[[channel % 3 for _, channel, _ in rows]]
+        return list(values * fade * amplitudes)
+    
+    if noise_type == 'PERLIN':
+        gradients = [noise_gradients(seed, channel) for seed, channel, _ in rows]
+    offsets = [[] for _ in rows]
+    for frame in range(count):
+        # Calculate shake amount with decay
+        fade = 1.0 - (frame / count) * decay
+        t = frame * frequency
+        for row, (seed, channel, amplitude) in enumerate(rows):
+            if noise_type == 'PERLIN':
+                value = fractal_noise(t, gradients[row], octaves)
+            elif noise_type == 'RANDOM':
+                value = noise[row][frame]
+            else:  # SINE
+                value = (math.sin(t), math.cos(t), math.sin(t * 0.5))[channel % 3]
+            offsets[row].append(value * fade * amplitude)
+    return offsets
+
+def ensure_fcurve(obj, data_path, index, group="Object Transforms"):
+    anim = obj.animation_data or obj.animation_data_create()
+    if anim.action is None:
+        anim.action = bpy.data.actions.new(name=f"{obj.name}Action")
+    fcurve = anim.action.fcurves.find(data_path, index=index)
+    if fcurve is None:
+        fcurve = anim.action.fcurves.new(data_path, index=index, action_group=group)
+    return fcurve
+
+def remove_fcurve_keys(fcurve, frame_start, frame_end):
+    # Remove the keys in [frame_start, frame_end], returning their flat
+    # (frame, value) coordinates
+    points = fcurve.keyframe_points
+    co = [0.0] * (2 * len(points))
+    points.foreach_get("co", co)
+    removed = []
+    for i in reversed(range(len(points))):
+        if frame_start <= co[2 * i] <= frame_end:
+            removed[:0] = co[2 * i:2 * i + 2]
+            points.remove(points[i], fast=True)
+    return removed
+
+def add_fcurve_keys(fcurve, co):
+    # Add keys from flat (frame, value) coordinates in one bulk write
+    points = fcurve.keyframe_points
+    kept = [0.0] * (2 * len(points))
+    points.foreach_get("co", kept)
+    points.add(len(co) // 2)
+    if np is not None:
+        co = np.concatenate((np.asarray(kept, dtype=np.float32), np.asarray(co, dtype=np.float32)))
+    else:
+        co = kept + list(co)
+    points.foreach_set("co", co)
+    
+    # Sorts the new keys in and recalculates their handles
+    fcurve.update()
+
+def write_fcurve_keys(fcurve, frame_start, values):
+    # Key values on consecutive frames from frame_start, replacing any keys
+    # already in that range. Returns the coordinates of the replaced keys.
+    count = len(values)
+    if count == 0:
+        return []
+    frame_end = frame_start + count - 1
+    removed = remove_fcurve_keys(fcurve, frame_start, frame_end)
+    
+    if np is not None:
+        co = np.empty((count, 2), dtype=np.float32)
+        co[:, 0] = np.arange(frame_start, frame_end + 1)
+        co[:, 1] = values
+        co = co.ravel()
+    else:
+        co = []
+        for i, value in enumerate(values):
+            co.extend((frame_start + i, value))
+    add_fcurve_keys(fcurve, co)
+    return removed
+
+# Custom property on the camera recording what the last shake added, so
+# clearing removes exactly that and nothing the user keyed themselves
+SHAKE_PROPERTY = "camhelper_shake"
+
+def shake_noise_settings(amplitude, frequency, decay, frames):
+    # Noise modifier strength, scale and blend out matching the baked shake.
+    # With the Replace blend type the modifier adds (noise - 0.5) * strength
+    # with noise in [0, 1], and samples noise at frame / scale.
+    strength = amplitude * 2.0
+    scale = 1.0 / max(frequency, 1e-6)
+    blend_out = min(max(frames * decay, 0.0), max(frames, 0))
+    return strength, scale, blend_out
+
+def shake_amplitudes(obj, effects):
+    # Amplitude per shaken channel. Rotation is only shaken on Euler
+    # rotation modes, quaternion and axis angle keys are left alone.
+    amplitudes = [effects.shake_amplitude] * 3
+    if effects.shake_rotation > 0.0 and obj.rotation_mode not in {'QUATERNION', 'AXIS_ANGLE'}:
+        amplitudes += [effects.shake_rotation] * 3
+    return amplitudes
+
+def channel_fcurve(obj, channel):
+    # Existing F-Curve of a shake channel, or None
+    action = obj.animation_data.action if obj.animation_data else None
+    if action is None:
+        return None
+    data_path, index = SHAKE_CHANNELS[channel]
+    return action.fcurves.find(data_path, index=index)
+
+def add_shake_keys(obj, offsets, frame_start, frame_end):
+    # Bake offsets from shake_offsets_batch, one row per channel, as keys
+    channels = range(len(offsets))
+    base = [getattr(obj, SHAKE_CHANNELS[c][0])[SHAKE_CHANNELS[c][1]] for c in channels]
+    frames = frame_end - frame_start
+    
+    # Keys go on frame_start up to the frame before frame_end
+    record = {
+        "mode": 'KEYS',
+        "frame_start": frame_start,
+        "frame_end": frame_start + frames - 1,
+        "channels": list(channels),
+        "base": base,
+        "created": [0] * len(channels),
+        "replaced": {}
+    }
+    for channel in channels:
+        record["created"][channel] = int(channel_fcurve(obj, channel) is None)
+        fcurve = ensure_fcurve(obj, *SHAKE_CHANNELS[channel])
+        replaced = write_fcurve_keys(fcurve, frame_start, [base[channel] + offset for offset in offsets[channel]])
+        if len(replaced):
+            record["replaced"][str(channel)] = [float(v) for v in replaced]
+    obj[SHAKE_PROPERTY] = record
+
+def add_shake_keys_batch(objects, effects, frame_start, frame_end):
+    # Bake shake on several objects from one batched noise computation.
+    # Each object gets the seed offset by its position in objects.
+    amplitudes = [shake_amplitudes(obj, effects) for obj in objects]
+    rows = [(effects.shake_seed + i, channel, amplitude)
+            for i, obj_amplitudes in enumerate(amplitudes)
+            for channel, amplitude in enumerate(obj_amplitudes)]
+    offsets = shake_offsets_batch(
+        effects.shake_noise_type,
+        frame_end - frame_start,
+        rows,
+        effects.shake_frequency,
+        effects.shake_decay,
+        effects.shake_octaves
+    )
+    
+    start = 0
+    for obj, obj_amplitudes in zip(objects, amplitudes):
+        add_shake_keys(obj, offsets[start:start + len(obj_amplitudes)], frame_start, frame_end)
+        start += len(obj_amplitudes)
+
+def add_shake_modifiers(obj, effects, frame_start, frame_end, seed=None):
+    if seed is None:
+        seed = effects.shake_seed
+    amplitudes = shake_amplitudes(obj, effects)
+    channels = range(len(amplitudes))
+    base = [getattr(obj, SHAKE_CHANNELS[c][0])[SHAKE_CHANNELS[c][1]] for c in channels]
+    
+    record = {
+        "mode": 'MODIFIER',
+        "frame_start": frame_start,
+        "frame_end": frame_end,
+        "channels": list(channels),
+        "base": base,
+        "created": [0] * len(channels),
+        "phases": [0.0] * len(channels)
+    }
+    for channel in channels:
+        strength, scale, blend_out = shake_noise_settings(
+            amplitudes[channel],
+            effects.shake_frequency,
+            effects.shake_decay,
+            frame_end - frame_start
+        )
+        created = channel_fcurve(obj, channel) is None
+        fcurve = ensure_fcurve(obj, *SHAKE_CHANNELS[channel])
+        if not len(fcurve.keyframe_points):
+            # Modifiers are not evaluated on an F-Curve without keys
+            add_fcurve_keys(fcurve, (frame_start, base[channel]))
+            created = True
+        
+        mod = fcurve.modifiers.new('NOISE')
+        # Replace adds (noise - 0.5) * strength, centred on the curve
+        mod.blend_type = 'REPLACE'
+        mod.strength = strength
+        mod.scale = scale
+        mod.depth = effects.shake_octaves - 1
+        # The phase comes from the seed so the shake is reproducible. A whole
+        # number survives the round trip through the float property, so
+        # clearing can find this modifier again.
+        rng = random.Random(seed * len(SHAKE_CHANNELS) + channel)
+        mod.phase = float(rng.randrange(1, 100000))
+        mod.use_restricted_range = True
+        mod.frame_end = frame_end
+        mod.frame_start = frame_start
+        mod.blend_out = blend_out
+        
+        record["created"][channel] = int(created)
+        record["phases"][channel] = mod.phase
+    obj[SHAKE_PROPERTY] = record
+
+def shake_targets(context):
+    # Cameras the shake operators work on, sorted by name so each one gets
+    # the same seed offset every time
+    scene = context.scene
+    target = scene.camera_effects.shake_target
+    if target == 'SELECTED':
+        cameras = [obj for obj in context.selected_objects if obj.type == 'CAMERA']
+    elif target == 'GROUP':
+        group_name = scene.cam_helper_props.active_camera_group
+        group_empty = scene.objects.get(f"CameraGroup_{group_name}")
+        cameras = [obj for obj in group_empty.children if obj.type == 'CAMERA'] if group_empty else []
+    else:
+        cameras = [scene.camera] if scene.camera else []
+    return sorted(cameras, key=lambda obj: obj.name)
+
+def clear_shake(obj):
+    # Undo the last shake recorded on obj. Returns False if there was none.
+    record = obj.get(SHAKE_PROPERTY)
+    if record is None:
+        return False
+    
+    action = obj.animation_data.action if obj.animation_data else None
+    mode = record["mode"]
+    frame_start = record["frame_start"]
+    frame_end = record["frame_end"]
+    replaced = record.get("replaced", {})
+    
+    for channel in record.get("channels", range(3)):
+        fcurve = channel_fcurve(obj, channel)
+        if fcurve is None:
+            continue
+        
+        if mode == 'MODIFIER':
+            for mod in list(fcurve.modifiers):
+                if mod.type == 'NOISE' and mod.phase == record["phases"][channel]:
+                    fcurve.modifiers.remove(mod)
+            # Only the key added to carry the modifier is left
+            unused = len(fcurve.keyframe_points) <= 1
+        else:
+            remove_fcurve_keys(fcurve, frame_start, frame_end)
+            if str(channel) in replaced:
+                add_fcurve_keys(fcurve, list(replaced[str(channel)]))
+            else:
+                fcurve.update()
+            unused = not len(fcurve.keyframe_points)
+        
+        if record["created"][channel] and unused and not len(fcurve.modifiers):
+            action.fcurves.remove(fcurve)
+            data_path, index = SHAKE_CHANNELS[channel]
+            getattr(obj, data_path)[index] = record["base"][channel]
+    
+    del obj[SHAKE_PROPERTY]
+    return True
+
+# Camera paths: every path type is built from cubic Bezier segments, so one
+# evaluator serves the arc length table and the baked transforms. Knots are
+# (co, handle_left, handle_right) tuples in world space.
+
+# Relative difference between chord and split length below which a piece of
+# a segment counts as straight when measuring arc length
+PATH_TOLERANCE = 1e-5
+# Relative difference between the lengths of the two halves of a piece above
+# which its speed counts as uneven, so the piece is split further. Straight
+# segments with uneven handles need this, as chord and arc always agree.
+PATH_SPEED_TOLERANCE = 1e-2
+# Largest coefficient of variation of the per-frame distance travelled on a
+# constant speed bake before the bake is reported as uneven
+PATH_SPEED_LIMIT = 0.01
+# Gauss-Legendre nodes and weights on [0, 1], for arc length checks that do
+# not go through the table
+PATH_GAUSS = ((0.5 - 0.5 * math.sqrt(3.0 / 5.0), 5.0 / 18.0), (0.5, 8.0 / 18.0),
+              (0.5 + 0.5 * math.sqrt(3.0 / 5.0), 5.0 / 18.0))
+# Widest parameter span integrated at once by path_length
+PATH_GAUSS_STEP = 1.0 / 16.0
+# Deepest subdivision of one segment while measuring arc length
+PATH_MAX_DEPTH = 16
+# Handle length of a quarter circle Bezier, relative to the radius
+CIRCLE_KAPPA = 0.5522847498
+
+def _lerp3(a, b, t):
+    return (a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t, a[2] + (b[2] - a[2]) * t)
+
+def _distance3(a, b):
+    return math.sqrt((b[0] - a[0]) ** 2 + (b[1] - a[1]) ** 2 + (b[2] - a[2]) ** 2)
+
+# Nearest cameras considered for each camera when shortening the visiting
+# order, and the cap on improvement passes
+ORDER_NEIGHBOURS = 8
+ORDER_MAX_PASSES = 50
+
+def _reversal_gain(points, order, first, last):
+    # Length saved by reversing order[first:last + 1] of an open path
+    a = points[order[first - 1]] if first > 0 else None
+    b = points[order[first]]
+    c = points[order[last]]
+    d = points[order[last + 1]] if last < len(order) - 1 else None
+    gain = 0.0
+    if a is not None:
+        gain += _distance3(a, b) - _distance3(a, c)
+    if d is not None:
+        gain += _distance3(c, d) - _distance3(b, d)
+    return gain
+
+def order_points(points):
+    # Short open path visiting every point: a nearest neighbour tour from
+    # the point furthest from the centre, then 2-opt moves restricted to
+    # each point's nearest neighbours. Returns indices into points.
+    count = len(points)
+    if count < 3:
+        return list(range(count))
+    
+    tree = kdtree.KDTree(count)
+    for i, co in enumerate(points):
+        tree.insert(co, i)
+    tree.balance()
+    
+    center = tuple(sum(p[axis] for p in points) / count for axis in range(3))
+    current = max(range(count), key=lambda i: _distance3(points[i], center))
+    visited = [False] * count
+    visited[current] = True
+    order = [current]
+    for _ in range(count - 1):
+        _, current, _ = tree.find(points[current], filter=lambda i: not visited[i])
+        visited[current] = True
+        order.append(current)
+    
+    neighbours = [[j for _, j, _ in tree.find_n(co, ORDER_NEIGHBOURS + 1) if j != i]
+                  for i, co in enumerate(points)]
+    position = [0] * count
+    for i, point in enumerate(order):
+        position[point] = i
+    
+    for _ in range(ORDER_MAX_PASSES):
+        improved = False
+        for a in range(count):
+            for b in neighbours[a]:
+                i, j = sorted((position[a], position[b]))
+                if j - i < 2:
+                    continue
+                # Make a and b neighbours, either after the earlier one or
+                # before the later one
+                for first, last in ((i + 1, j), (i, j - 1)):
+                    if _reversal_gain(points, order, first, last) > 1e-9:
+                        order[first:last + 1] = order[first:last + 1][::-1]
+                        for k in range(first, last + 1):
+                            position[order[k]] = k
+                        improved = True
+                        break
+        if not improved:
+            break
+    return order
+
+def path_knots(path_type, points, radius=1.0):
+    # Knots of the path through points, and whether the path is closed
+    count = len(points)
+    knots = []
+    
+    if path_type == 'CIRCULAR':
+        # Horizontal circle around the points, starting at the first one
+        center = tuple(sum(p[axis] for p in points) / count for axis in range(3))
+        ring = mean(math.hypot(p[0] - center[0], p[1] - center[1]) for p in points)
+        if ring > 1e-6:
+            radius = ring
+        start = math.atan2(points[0][1] - center[1], points[0][0] - center[0])
+        for quarter in range(4):
+            angle = start + quarter * math.pi / 2
+            co = (center[0] + radius * math.cos(angle), center[1] + radius * math.sin(angle), center[2])
+            handle = (-math.sin(angle) * radius * CIRCLE_KAPPA, math.cos(angle) * radius * CIRCLE_KAPPA, 0.0)
+            knots.append((
+                co,
+                (co[0] - handle[0], co[1] - handle[1], co[2]),
+                (co[0] + handle[0], co[1] + handle[1], co[2])
+            ))
+        return knots, True
+    
+    for i, co in enumerate(points):
+        prev = points[max(i - 1, 0)]
+        following = points[min(i + 1, count - 1)]
+        if path_type == 'LINEAR':
+            # Handles a third of the way to the neighbours keep segments straight
+            knots.append((co, _lerp3(co, prev, 1.0 / 3.0), _lerp3(co, following, 1.0 / 3.0)))
+        else:  # BEZIER
+            # Catmull-Rom tangents, the curve passes through every point
+            tangent = tuple((following[axis] - prev[axis]) / (2.0 if 0 < i < count - 1 else 1.0) / 3.0
+                            for axis in range(3))
+            knots.append((
+                co,
+                (co[0] - tangent[0], co[1] - tangent[1], co[2] - tangent[2]),
+                (co[0] + tangent[0], co[1] + tangent[1], co[2] + tangent[2])
+            ))
+    return knots, False
+
+def path_segments(knots, cyclic):
+    # Cubic segments (p0, h0, h1, p1) between consecutive knots
+    pairs = list(zip(knots, knots[1:]))
+    if cyclic:
+        pairs.append((knots[-1], knots[0]))
+    return [(a[0], a[2], b[1], b[0]) for a, b in pairs]
+
+def bezier_point(segment, u):
+    p0, h0, h1, p1 = segment
+    v = 1.0 - u
+    a, b, c, d = v * v * v, 3.0 * v * v * u, 3.0 * v * u * u, u * u * u
+    return tuple(a * p0[axis] + b * h0[axis] + c * h1[axis] + d * p1[axis] for axis in range(3))
+
+def bezier_speed(segment, u):
+    # Length of the derivative at u, distance travelled per unit of u
+    p0, h0, h1, p1 = segment
+    v = 1.0 - u
+    a, b, c = 3.0 * v * v, 6.0 * v * u, 3.0 * u * u
+    return math.sqrt(sum((a * (h0[axis] - p0[axis]) + b * (h1[axis] - h0[axis]) + c * (p1[axis] - h1[axis])) ** 2
+                         for axis in range(3)))
+
+def arc_length_table(segments, tolerance=PATH_TOLERANCE):
+    # Cumulative arc length at increasing path parameters, where parameter
+    # i + u is position u along segment i. Segments are split adaptively
+    # until each piece is both straight and travelled at an even speed, so
+    # the parameter can be interpolated linearly inside it.
+    params = [0.0]
+    lengths = [0.0]
+    for i, segment in enumerate(segments):
+        stack = [(1.0, 0.0, bezier_point(segment, 1.0), bezier_point(segment, 0.0), 0)]
+        while stack:
+            b, a, pb, pa, depth = stack.pop()
+            m = (a + b) * 0.5
+            pm = bezier_point(segment, m)
+            chord = _distance3(pa, pb)
+            left = _distance3(pa, pm)
+            right = _distance3(pm, pb)
+            split = left + right
+            if depth < PATH_MAX_DEPTH and (depth < 2 or split - chord > tolerance * split or
+                                           abs(left - right) > PATH_SPEED_TOLERANCE * split):
+                # Right half goes first so the left half is measured first
+                stack.append((b, m, pb, pm, depth + 1))
+                stack.append((m, a, pm, pa, depth + 1))
+            else:
+                params.append(i + b)
+                lengths.append(lengths[-1] + split)
+    return params, lengths
+
+def param_at_length(table, length, segments=None):
+    # Path parameter at an arc length, interpolated in the table. Given the
+    # segments, a Newton step on the straight table piece corrects the
+    # speed change left inside it.
+    params, lengths = table
+    i = min(max(bisect.bisect_left(lengths, length), 1), len(lengths) - 1)
+    span = lengths[i] - lengths[i - 1]
+    t = (length - lengths[i - 1]) / span if span > 0.0 else 0.0
+    param = params[i - 1] + (params[i] - params[i - 1]) * t
+    if segments is None or span <= 0.0:
+        return param
+    
+    k = min(int(params[i - 1]), len(segments) - 1)
+    u = param - k
+    speed = bezier_speed(segments[k], u)
+    if speed > 0.0:
+        start = bezier_point(segments[k], params[i - 1] - k)
+        travelled = _distance3(start, bezier_point(segments[k], u))
+        u -= (travelled - (length - lengths[i - 1])) / speed
+        param = k + min(max(u, params[i - 1] - k), params[i] - k)
+    return param
+
+def path_point(segments, param):
+    i = min(int(param), len(segments) - 1)
+    return bezier_point(segments[i], param - i)
+
+def ease_fraction(x, easing):
+    # Share of the path travelled at time x in [0, 1]. EASE matches the
+    # default Bezier interpolation between two flat keys.
+    if easing == 'EASE':
+        return x * x * (3.0 - 2.0 * x)
+    return x
+
+def sample_params(segments, count, easing='CONSTANT', table=None):
+    # count path parameters from start to end of the path, evenly spaced in time
+    if table is None:
+        table = arc_length_table(segments)
+    total = table[1][-1]
+    steps = max(count - 1, 1)
+    return [param_at_length(table, ease_fraction(i / steps, easing) * total, segments)
+            for i in range(count)]
+
+def sample_path(segments, count, easing='CONSTANT', table=None):
+    # count positions from start to end of the path, evenly spaced in time
+    return [path_point(segments, param) for param in sample_params(segments, count, easing, table)]
+
+def path_length(segments, start, end):
+    # Arc length between two path parameters, integrated from the curve's
+    # speed in pieces of at most PATH_GAUSS_STEP, independent of the table
+    length = 0.0
+    while start < end:
+        k = min(int(start), len(segments) - 1)
+        stop = min(end, k + 1.0) if k < len(segments) - 1 else end
+        pieces = max(1, math.ceil((stop - start) / PATH_GAUSS_STEP))
+        width = (stop - start) / pieces
+        for piece in range(pieces):
+            a = start - k + piece * width
+            length += width * sum(w * bezier_speed(segments[k], a + x * width) for x, w in PATH_GAUSS)
+        start = stop
+    return length
+
+def speed_variation(segments, params):
+    # Coefficient of variation of the distance travelled between consecutive
+    # parameters, 0 for perfectly even speed
+    steps = [path_length(segments, a, b) for a, b in zip(params, params[1:])]
+    average = sum(steps) / len(steps) if steps else 0.0
+    if average <= 0.0:
+        return 0.0
+    return math.sqrt(sum((step - average) ** 2 for step in steps) / len(steps)) / average
+
+# Camera binding: placements are plain world space positions, computed for
+# all cameras before any object is touched
+
+# Custom property on a live binding's empty naming the property on the same
+# empty that drives the camera placement
+BINDING_PROPERTY = "camhelper_binding"
+
+def live_terms(center, positions, scale, flat=False):
+    # Per camera (k, b) with position - center = scale * k + b, so a driver
+    # can rebuild the placement from scale. flat keeps heights out of the
+    # scaled part, for circles.
+    terms = []
+    for co in positions:
+        local = [co[axis] - center[axis] for axis in range(3)]
+        k = [value / scale for value in local]
+        b = [0.0, 0.0, 0.0]
+        if flat:
+            k[2], b[2] = 0.0, local[2]
+        terms.append((k, b))
+    return terms
+
+def centroid(points):
+    count = len(points)
+    return tuple(sum(p[axis] for p in points) / count for axis in range(3))
+
+def circle_positions(center, radius, heights):
+    # Evenly spaced positions on a horizontal circle, one per height
+    angle_step = 2 * math.pi / len(heights)
+    return [(center[0] + radius * math.cos(angle_step * i),
+             center[1] + radius * math.sin(angle_step * i),
+             z) for i, z in enumerate(heights)]
+
+def grid_shape(count, dimensions):
+    # Smallest near-square (or near-cube) grid holding count cells
+    side = math.ceil(count ** (1.0 / dimensions) - 1e-9)
+    shape = [side] * dimensions
+    # Drop empty trailing rows and layers
+    for axis in reversed(range(1, dimensions)):
+        cells = 1
+        for other in range(dimensions):
+            if other != axis:
+                cells *= shape[other]
+        shape[axis] = math.ceil(count / cells)
+    return shape
+
+def grid_positions(origin, axes, spacing, shape, count):
+    # count positions filling the grid cell by cell, first axis fastest
+    positions = []
+    for i in range(count):
+        co = list(origin)
+        for axis, size in zip(axes, shape):
+            step = i % size
+            i //= size
+            for k in range(3):
+                co[k] += axis[k] * spacing * step
+        positions.append(tuple(co))
+    return positions
+
+# Angle between successive points of a Fibonacci lattice
+GOLDEN_ANGLE = math.pi * (3.0 - math.sqrt(5.0))
+
+def fibonacci_positions(center, radius, count, hemisphere=False):
+    # count nearly evenly spaced positions on a sphere, or its upper half,
+    # from the top down
+    span = 1.0 if hemisphere else 2.0
+    positions = []
+    for i in range(count):
+        z = 1.0 - (i + 0.5) / count * span
+        ring = math.sqrt(max(1.0 - z * z, 0.0))
+        angle = i * GOLDEN_ANGLE
+        positions.append((center[0] + radius * ring * math.cos(angle),
+                          center[1] + radius * ring * math.sin(angle),
+                          center[2] + radius * z))
+    return positions
 		
 def update_passepartout(self, context):
     # Get active camera and selected cameras
@@ -149,23 +1805,62 @@ class CamHelperProperties(PropertyGroup):
         unit='LENGTH'
     )
     
+    live_binding: BoolProperty(
+        name="Live",
+        description="Drive the camera placement from a property on the controller empty, "
+                    "so editing it or moving the empty updates the cameras",
+        default=False
+    )
+    
     binding_type: EnumProperty(
         name="Binding Type",
         items=[
             ('LINEAR', "Linear", "Linear path between cameras"),
             ('CIRCULAR', "Circular", "Circular path around target"),
             ('ARRAY', "Array", "Array of cameras"),
-            ('ORBIT', "Orbit", "Orbital arrangement of cameras")
+            ('ORBIT', "Orbit", "Orbital arrangement of cameras"),
+            ('DOME', "Dome", "Cameras spread evenly over a dome or sphere around the 3D cursor")
         ],
         default='LINEAR'
     )
     
     array_count: IntProperty(
         name="Count",
-        description="Number of cameras in array",
+        description="Number of cameras in array, missing ones are added as linked duplicates",
         default=3,
         min=2,
-        max=10
+        soft_max=100,
+        max=10000
+    )
+    
+    array_layout: EnumProperty(
+        name="Layout",
+        description="Shape of the camera array",
+        items=[
+            ('1D', "Line", "Row along the reference camera's view direction"),
+            ('2D', "Grid", "Grid across the reference camera's view"),
+            ('3D', "Volume", "Stacked grids along the reference camera's view direction")
+        ],
+        default='1D'
+    )
+    
+    dome_count: IntProperty(
+        name="Count",
+        description="Number of cameras on the dome, missing ones are added as linked duplicates",
+        default=100,
+        min=2,
+        soft_max=500,
+        max=10000
+    )
+    
+    dome_coverage: EnumProperty(
+        name="Coverage",
+        description="Part of the sphere covered by the cameras",
+        items=[
+            ('HEMISPHERE', "Hemisphere", "Upper half of the sphere"),
+            ('SPHERE', "Sphere", "Whole sphere")
+        ],
+        default='HEMISPHERE'
     )
     
     orbit_radius: FloatProperty(
@@ -313,6 +2008,26 @@ class CamHelperProperties(PropertyGroup):
         min=1
     )
     
+    path_easing: EnumProperty(
+        name="Speed",
+        description="Speed profile of the camera along the path",
+        items=[
+            ('CONSTANT', "Constant", "Travel at the same speed along the whole path"),
+            ('EASE', "Ease In/Out", "Accelerate from the start and slow down into the end")
+        ],
+        default='CONSTANT'
+    )
+    
+    path_bake: EnumProperty(
+        name="Bake",
+        description="How the camera is moved along the path",
+        items=[
+            ('OFFSET', "Offset Keys", "Follow Path constraint animated by two offset keys"),
+            ('TRANSFORMS', "Transforms", "Location keys on every frame, no constraint")
+        ],
+        default='OFFSET'
+    )
+    
     # Camera Effects
     use_dolly_zoom: BoolProperty(
         name="Dolly Zoom",
@@ -357,21 +2072,192 @@ class CamHelperProperties(PropertyGroup):
         description="Display camera names in viewport",
         default=True
     )
-
-    camera_display_size: FloatProperty(
-        name="Display Size",
-        description="Size of camera objects in viewport",
-        default=1.0,
-        min=0.1,
-        max=5.0
+
+    cluster_cameras: BoolProperty(
+        name="Cluster Cameras",
+        description="Draw cameras that crowd together on screen as one marker with a count",
+        default=True
+    )
+
+    camera_display_size: FloatProperty(
+        name="Display Size",
+        description="Size of camera objects in viewport",
+        default=1.0,
+        min=0.1,
+        max=5.0
+    )
+
+class CameraEffectsProperties(PropertyGroup):
+    shake_target: EnumProperty(
+        name="Shake Target",
+        description="Cameras the shake is added to",
+        items=[
+            ('ACTIVE', "Active Camera", "Shake the scene camera"),
+            ('SELECTED', "Selected Cameras", "Shake every selected camera"),
+            ('GROUP', "Camera Group", "Shake the cameras of the active camera group")
+        ],
+        default='ACTIVE'
+    )
+    
+    shake_mode: EnumProperty(
+        name="Shake Mode",
+        description="How the camera shake is added",
+        items=[
+            ('MODIFIER', "Noise Modifier", "Procedural noise on the location F-Curves, no keys are baked"),
+            ('KEYS', "Bake Keys", "Bake one key per frame")
+        ],
+        default='MODIFIER'
+    )
+    
+    shake_noise_type: EnumProperty(
+        name="Noise Type",
+        description="Kind of motion used for the camera shake",
+        items=[
+            ('PERLIN', "Perlin", "Smooth fractal noise"),
+            ('RANDOM', "Random", "Independent random offset on every frame"),
+            ('SINE', "Sine", "Regular oscillation")
+        ],
+        default='PERLIN'
+    )
+    
+    shake_amplitude: FloatProperty(
+        name="Amplitude",
+        description="Largest offset of the shake",
+        default=0.1,
+        min=0.0,
+        soft_max=1.0,
+        unit='LENGTH'
+    )
+    
+    shake_frequency: FloatProperty(
+        name="Frequency",
+        description="Speed of the shake",
+        default=1.0,
+        min=0.01,
+        soft_max=10.0
+    )
+    
+    shake_decay: FloatProperty(
+        name="Decay",
+        description="How much the shake fades out by the end of the frame range",
+        default=0.0,
+        min=0.0,
+        max=1.0,
+        subtype='FACTOR'
+    )
+    
+    shake_rotation: FloatProperty(
+        name="Rotation",
+        description="Largest rotation of the shake, 0 leaves the rotation untouched",
+        default=0.0,
+        min=0.0,
+        soft_max=math.radians(10.0),
+        subtype='ANGLE'
+    )
+    
+    shake_seed: IntProperty(
+        name="Seed",
+        description="Seed of the shake, the same seed always gives the same shake",
+        default=0,
+        min=0
+    )
+    
+    shake_octaves: IntProperty(
+        name="Octaves",
+        description="Number of noise layers, more adds finer detail",
+        default=2,
+        min=1,
+        max=8
+    )
+
+class BeatAnalyzerProperties(PropertyGroup):
+    audio_file: StringProperty(
+        name="Audio File",
+        description="Select audio file to analyze (WAV, or MP3/OGG/FLAC through Blender's audio library)",
+        default="",
+        subtype='FILE_PATH'
+    )
+    
+    detection_mode: EnumProperty(
+        name="Detection",
+        description="Method used to detect beats",
+        items=[
+            ('AMPLITUDE', "Amplitude", "Mean absolute amplitude above the threshold"),
+            ('SPECTRAL_FLUX', "Spectral Flux", "Onsets from spectral change with an adaptive threshold")
+        ],
+        default='AMPLITUDE'
+    )
+    
+    downmix_mode: EnumProperty(
+        name="Channels",
+        description="How multichannel audio is reduced to one analysis channel",
+        items=[
+            ('MEAN', "Mean", "Average of all channels"),
+            ('RMS', "RMS", "Root mean square across channels, ignoring phase differences. "
+             "Amplitude onsets only, spectral and tempo analysis use Mean"),
+            ('FIRST', "First Channel", "Only the first channel")
+        ],
+        default='MEAN'
+    )
+    
+    use_bands: BoolProperty(
+        name="Band Markers",
+        description="Detect onsets separately per frequency band and tag markers with the band",
+        default=False
+    )
+    
+    analysis_bands: EnumProperty(
+        name="Bands",
+        description="Frequency bands to detect onsets in",
+        items=[
+            ('KICK', "Kick", "30-150 Hz"),
+            ('SNARE', "Snare", "200-4000 Hz"),
+            ('HAT', "Hat", "6-16 kHz")
+        ],
+        options={'ENUM_FLAG'},
+        default={'KICK'}
+    )
+    
+    marker_mode: EnumProperty(
+        name="Markers",
+        description="Which analysis result is written as timeline markers",
+        items=[
+            ('ONSETS', "Onsets", "One marker per detected beat"),
+            ('BEATS', "Beat Grid", "Regular beat grid from the estimated tempo, named bar.beat"),
+            ('BARS', "Bars", "Downbeats of the estimated beat grid only, named by bar")
+        ],
+        default='ONSETS'
+    )
+    
+    beats_per_bar: IntProperty(
+        name="Beats per Bar",
+        description="Beats in one bar of the beat grid",
+        default=4,
+        min=1,
+        max=16
+    )
+    
+    min_bpm: FloatProperty(
+        name="Min BPM",
+        description="Slowest tempo considered by the tempo estimate",
+        default=60.0,
+        min=20.0,
+        max=300.0
     )
-
-class BeatAnalyzerProperties(PropertyGroup):
-    audio_file: StringProperty(
-        name="Audio File",
-        description="Select audio file to analyze (WAV format)",
-        default="",
-        subtype='FILE_PATH'
+    
+    max_bpm: FloatProperty(
+        name="Max BPM",
+        description="Fastest tempo considered by the tempo estimate",
+        default=180.0,
+        min=20.0,
+        max=300.0
+    )
+    
+    estimated_bpm: FloatProperty(
+        name="Tempo",
+        description="Tempo estimated by the last beat grid analysis",
+        default=0.0,
+        min=0.0
     )
     
     chunk_size: IntProperty(
@@ -387,12 +2273,26 @@ class BeatAnalyzerProperties(PropertyGroup):
         description="Beat detection threshold (lower = more beats detected)",
         default=0.6,
         min=0.1,
-        max=1.0
+        max=1.0,
+        update=update_beat_preview
+    )
+    
+    show_preview: BoolProperty(
+        name="Preview in Timeline",
+        description="Draw the last analysis, the threshold and the predicted beats in the timeline",
+        default=True,
+        update=update_beat_preview
+    )
+    
+    use_cache: BoolProperty(
+        name="Cache Analysis",
+        description="Reuse the stored analysis of unchanged files so only beat picking is redone",
+        default=True
     )
     
     clear_existing: BoolProperty(
         name="Clear Existing",
-        description="Clear existing beat markers before creating new ones",
+        description="Remove prefixed markers that are not part of the new analysis",
         default=True
     )
 
@@ -402,66 +2302,87 @@ class BeatAnalyzerProperties(PropertyGroup):
         default="Beat_"
     )
 
+    analysis_progress: FloatProperty(
+        name="Progress",
+        description="Progress of the running audio analysis",
+        default=0.0,
+        min=0.0,
+        max=100.0,
+        subtype='PERCENTAGE'
+    )
+
+class AudioAnalysisJob:
+    """State of one background analysis, shared with its worker thread"""
+    
+    # The worker never touches the operator: Blender frees a cancelled
+    # operator while the thread may still be reading its last block
+    def __init__(self, filepath, fps, settings):
+        self.progress = 0.0
+        self.result = None
+        self.preview = None
+        self.error = None
+        self.cancel = threading.Event()
+        self.thread = threading.Thread(target=self.run, args=(filepath, fps, settings), daemon=True)
+        
+    def run(self, filepath, fps, settings):
+        # Runs on the worker thread: no bpy access past this point
+        try:
+            scanner, framerate = scan_audio(
+                filepath,
+                chunk_size=settings['chunk_size'],
+                threshold=settings['threshold'],
+                mode=settings['mode'],
+                use_grid=settings['marker_mode'] != 'ONSETS',
+                downmix_mode=settings['downmix_mode'],
+                bands=settings['bands'],
+                cache_dir=settings['cache_dir'],
+                progress=self.set_progress,
+                cancel=self.cancel
+            )
+            # Nobody waits for a cancelled analysis, skip the rest of the work
+            if self.cancel.is_set():
+                return
+            self.result = beat_markers(
+                scanner,
+                framerate,
+                fps,
+                settings['marker_mode'],
+                settings['beats_per_bar'],
+                settings['min_bpm'],
+                settings['max_bpm']
+            )
+            
+            # Odd amplitude windows keep no envelope to preview
+            if np is not None and scanner.envelope() is not None:
+                key = beat_preview_key(filepath, settings['chunk_size'], settings['mode'], settings['marker_mode'],
+                                       settings['downmix_mode'], settings['bands'])
+                self.preview = BeatPreview(scanner, framerate, fps, key)
+        except Exception as e:
+            self.error = str(e)
+    
+    def set_progress(self, fraction):
+        self.progress = fraction
+
 class BEATANALYZER_OT_analyze_audio(Operator):
     bl_idname = "beatanalyzer.analyze_audio"
     bl_label = "Analyze Audio"
-    bl_description = "Analyze audio file and detect beats"
+    bl_description = "Analyze audio file and detect beats (Esc to cancel)"
+    
+    # Set while an analysis runs in the background
+    _running = False
     
     @classmethod
     def poll(cls, context):
-        return context.scene is not None
-    
-    def analyze_audio_simple(self, file_path, chunk_size=2048, threshold=0.6):
-        try:
-            with wave.open(file_path, 'rb') as wf:
-                n_channels = wf.getnchannels()
-                sampwidth = wf.getsampwidth()
-                framerate = wf.getframerate()
-                n_frames = wf.getnframes()
-                
-                raw_data = wf.readframes(n_frames)
-                
-                if sampwidth == 2:
-                    data = array.array('h', raw_data)
-                else:
-                    data = array.array('i', raw_data)
-                    
-                if n_channels == 2:
-                    data = data[::2]
-                
-                beats = []
-                current_frame = 0
-                window_size = chunk_size
-                
-                while current_frame < len(data) - window_size:
-                    window = data[current_frame:current_frame + window_size]
-                    amplitude = sum(abs(x) for x in window) / window_size
-                    
-                    if amplitude > threshold * 32767:
-                        frame_time = current_frame / framerate
-                        frame_number = int(frame_time * bpy.context.scene.render.fps)
-                        beats.append(frame_number)
-                        current_frame += window_size
-                    else:
-                        current_frame += window_size // 2
-                        
-                return beats
-                
-        except Exception as e:
-            self.report({'ERROR'}, f"Error analyzing audio: {str(e)}")
-            return None
+        return context.scene is not None and not cls._running
     
-    def create_markers(self, context, beat_frames):
+    def create_markers(self, context, beat_markers):
         props = context.scene.beat_analyzer_props
-        
-        if props.clear_existing:
-            for marker in context.scene.timeline_markers:
-                if marker.name.startswith(props.marker_prefix):
-                    context.scene.timeline_markers.remove(marker)
-        
-        for i, frame in enumerate(beat_frames):
-            marker = context.scene.timeline_markers.new(f"{props.marker_prefix}{i+1}", frame=frame)
-            #marker.color = tuple(props.marker_color)
+        return sync_beat_markers(
+            context.scene.timeline_markers,
+            props.marker_prefix,
+            beat_markers,
+            remove_stale=props.clear_existing
+        )
     
     def execute(self, context):
         props = context.scene.beat_analyzer_props
@@ -471,31 +2392,101 @@ class BEATANALYZER_OT_analyze_audio(Operator):
             return {'CANCELLED'}
         
         filepath = bpy.path.abspath(props.audio_file)
-        if not filepath.lower().endswith('.wav'):
-            self.report({'ERROR'}, "Only WAV files are supported")
+        if not is_supported_audio(filepath):
+            self.report({'ERROR'}, "Unsupported audio format")
             return {'CANCELLED'}
         
         if not os.path.exists(filepath):
             self.report({'ERROR'}, "Audio file not found")
             return {'CANCELLED'}
         
-        beat_frames = self.analyze_audio_simple(
-            filepath,
-            chunk_size=props.chunk_size,
-            threshold=props.threshold
-        )
+        self._job = AudioAnalysisJob(filepath, context.scene.render.fps, self.analysis_settings(props))
+        
+        props.analysis_progress = 0.0
+        BEATANALYZER_OT_analyze_audio._running = True
+        self._job.thread.start()
+        
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.1, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+    
+    def analysis_settings(self, props):
+        # Plain copy of the settings for the worker thread
+        return {
+            'chunk_size': props.chunk_size,
+            'threshold': props.threshold,
+            'mode': props.detection_mode,
+            'marker_mode': props.marker_mode,
+            'beats_per_bar': props.beats_per_bar,
+            'min_bpm': min(props.min_bpm, props.max_bpm),
+            'max_bpm': max(props.min_bpm, props.max_bpm),
+            'downmix_mode': props.downmix_mode,
+            'bands': selected_bands(props),
+            'cache_dir': audio_cache_dir() if props.use_cache else None,
+        }
+    
+    def modal(self, context, event):
+        # Only a press: the release of an Esc that left a text field also
+        # reaches this handler
+        if event.type == 'ESC' and event.value == 'PRESS':
+            self.cancel(context)
+            self.report({'WARNING'}, "Audio analysis cancelled")
+            return {'CANCELLED'}
+        
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
         
-        if beat_frames is None:
+        job = self._job
+        context.scene.beat_analyzer_props.analysis_progress = job.progress * 100.0
+        self.redraw_panels(context)
+        
+        if job.thread.is_alive():
+            return {'PASS_THROUGH'}
+        
+        self.finish(context)
+        
+        if job.error is not None:
+            self.report({'ERROR'}, f"Error analyzing audio: {job.error}")
             return {'CANCELLED'}
         
-        if len(beat_frames) == 0:
+        markers, bpm = job.result
+        props = context.scene.beat_analyzer_props
+        props.estimated_bpm = bpm or 0.0
+        
+        if job.preview is not None:
+            _beat_preview['current'] = job.preview
+            tag_redraw_areas(context, {'DOPESHEET_EDITOR'})
+        
+        if len(markers) == 0:
             self.report({'WARNING'}, "No beats detected. Try adjusting the threshold")
             return {'CANCELLED'}
         
-        self.create_markers(context, beat_frames)
+        added, moved, removed = self.create_markers(context, markers)
         
-        self.report({'INFO'}, f"Created {len(beat_frames)} beat markers")
-        return {'FINISHED'}  
+        summary = f"{len(markers)} beat markers ({added} added, {moved} moved, {removed} removed)"
+        if bpm:
+            self.report({'INFO'}, f"{summary} at {bpm:.1f} BPM")
+        else:
+            self.report({'INFO'}, summary)
+        return {'FINISHED'}
+    
+    def cancel(self, context):
+        # The worker stops at its next block and its result is dropped;
+        # waiting for it here would block the UI
+        self._job.cancel.set()
+        self.finish(context)
+    
+    def finish(self, context):
+        context.window_manager.event_timer_remove(self._timer)
+        BEATANALYZER_OT_analyze_audio._running = False
+        context.scene.beat_analyzer_props.analysis_progress = 0.0
+        self.redraw_panels(context)
+    
+    def redraw_panels(self, context):
+        for area in context.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
         
 class CAMHELPER_OT_update_passepartout(Operator):
     bl_idname = "camhelper.update_passepartout"
@@ -514,70 +2505,45 @@ class CAMHELPER_OT_update_passepartout(Operator):
 
 class CAMHELPER_OT_add_camera_shake(Operator):
     """Add camera shake effect"""
-    bl_idname = "camera_helper.add_shake"
+    bl_idname = "camhelper.add_shake"
     bl_label = "Add Camera Shake"
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
         scene = context.scene
-        camera = scene.camera
         effects = scene.camera_effects
+        cameras = shake_targets(context)
 
-        if not camera:
-            self.report({'ERROR'}, "No active camera")
+        if not cameras:
+            self.report({'ERROR'}, "No camera to shake")
             return {'CANCELLED'}
 
-        # Store original transform
-        orig_loc = camera.location.copy()
-        
-        frame_start = scene.frame_start
-        frame_end = scene.frame_end
-        frames = frame_end - frame_start
-
-        # Apply shake
-        for frame in range(frames):
-            scene.frame_set(frame + frame_start)
-            
-            # Calculate shake amount with decay
-            decay = 1.0 - (frame / frames) * effects.shake_decay
-            amplitude = effects.shake_amplitude * decay
-
-            if effects.shake_noise_type == 'PERLIN':
-                offset = Vector((
-                    generate_noise(frame * effects.shake_frequency) * amplitude,
-                    generate_noise((frame + 1000) * effects.shake_frequency) * amplitude,
-                    generate_noise((frame + 2000) * effects.shake_frequency) * amplitude
-                ))
-            elif effects.shake_noise_type == 'RANDOM':
-                offset = Vector((
-                    random.uniform(-amplitude, amplitude),
-                    random.uniform(-amplitude, amplitude),
-                    random.uniform(-amplitude, amplitude)
-                ))
-            else:  # SINE
-                t = frame * effects.shake_frequency
-                offset = Vector((
-                    math.sin(t) * amplitude,
-                    math.cos(t) * amplitude,
-                    math.sin(t * 0.5) * amplitude
-                ))
-
-            camera.location = orig_loc + offset
-            camera.keyframe_insert(data_path="location", frame=frame + frame_start)
-
+        # Replace the previous shake instead of stacking on top of it
+        for camera in cameras:
+            clear_shake(camera)
+        
+        if effects.shake_mode == 'MODIFIER':
+            for i, camera in enumerate(cameras):
+                add_shake_modifiers(camera, effects, scene.frame_start, scene.frame_end, effects.shake_seed + i)
+            self.report({'INFO'}, f"Camera shake added as noise modifiers on {len(cameras)} camera(s)")
+        else:
+            add_shake_keys_batch(cameras, effects, scene.frame_start, scene.frame_end)
+            self.report({'INFO'}, f"Camera shake keyed on {len(cameras)} camera(s)")
         return {'FINISHED'}
 
 class CAMHELPER_OT_clear_camera_shake(Operator):
+    """Remove the camera shake added to the target cameras"""
     bl_idname = "camhelper.clear_camera_shake"
     bl_label = "Clear Camera Shake"
+    bl_options = {'REGISTER', 'UNDO'}
     
     def execute(self, context):
-        active_cam = context.scene.camera
-        if not active_cam or not active_cam.animation_data:
+        cleared = [camera for camera in shake_targets(context) if clear_shake(camera)]
+        if not cleared:
+            self.report({'WARNING'}, "No camera shake to remove")
             return {'CANCELLED'}
             
-        active_cam.animation_data.drivers.clear()
-        self.report({'INFO'}, "Camera shake removed")
+        self.report({'INFO'}, f"Camera shake removed from {len(cleared)} camera(s)")
         return {'FINISHED'}            
 
 class CAMHELPER_PT_camera_effects(Panel):
@@ -602,6 +2568,12 @@ class CAMHELPER_PT_camera_effects(Panel):
         row = box.row()
         row.prop(props, "path_frames")
         
+        row = box.row()
+        row.prop(props, "path_easing")
+        
+        row = box.row()
+        row.prop(props, "path_bake", expand=True)
+        
         row = box.row()
         row.operator("camhelper.create_path")
         
@@ -634,181 +2606,237 @@ class CAMHELPER_PT_camera_effects(Panel):
             row.operator("camhelper.add_roll")  
 
 class CAMHELPER_OT_bind_cameras(Operator):
+    """Bind the selected cameras to a controller empty"""
     bl_idname = "camhelper.bind_cameras"
     bl_label = "Bind Cameras"
+    bl_options = {'REGISTER', 'UNDO'}
     
-    def create_linear_path(self, context, selected_cameras):
-        props = context.scene.cam_helper_props
+    def create_empty(self, context, name, location):
+        # Created through bpy.data so there is no operator call, undo push
+        # or redraw per binding
+        empty = bpy.data.objects.new(name, None)
+        empty.empty_display_type = 'PLAIN_AXES'
+        empty.location = location
+        context.collection.objects.link(empty)
+        return empty
+    
+    def bind(self, empty, cameras, matrices):
+        # Parent every camera to empty and place it at its world matrix. The
+        # empty's matrix_world is not evaluated yet, so the basis is worked
+        # out from its location, relative to the empty with no parent inverse.
+        to_local = Matrix.Translation(empty.location).inverted()
+        identity = Matrix.Identity(4)
+        for cam, matrix in zip(cameras, matrices):
+            # Detach from a previous live binding
+            if cam.parent and BINDING_PROPERTY in cam.parent:
+                cam.driver_remove("location")
+                for constraint in list(cam.constraints):
+                    if constraint.type == 'TRACK_TO' and constraint.target == cam.parent:
+                        cam.constraints.remove(constraint)
+            
+            cam.parent = empty
+            cam.matrix_parent_inverse = identity
+            cam.matrix_basis = to_local @ matrix
+    
+    def make_live(self, context, empty, cameras, name, value, terms, track=True):
+        # Store value on the empty and drive every camera's location from it,
+        # so editing it moves the cameras without binding again. Tracking
+        # keeps the cameras aimed at the empty wherever it goes.
+        if not context.scene.cam_helper_props.live_binding:
+            return
+        
+        empty[name] = value
+        empty.id_properties_ui(name).update(min=0.001, subtype='DISTANCE')
+        empty[BINDING_PROPERTY] = name
         
-        # Sort cameras by name to ensure consistent order
-        cameras = sorted(selected_cameras, key=lambda x: x.name)
+        for cam, (k, b) in zip(cameras, terms):
+            cam.driver_remove("location")
+            for axis in range(3):
+                driver = cam.driver_add("location", axis).driver
+                driver.type = 'SCRIPTED'
+                var = driver.variables.new()
+                var.name = name
+                var.type = 'SINGLE_PROP'
+                var.targets[0].id = empty
+                var.targets[0].data_path = f'["{name}"]'
+                # Plain arithmetic keeps the driver on the fast expression
+                # path, no Python is run
+                driver.expression = f"{name} * {k[axis]:.6f} + {b[axis]:.6f}"
+            
+            if track:
+                constraint = cam.constraints.new(type='TRACK_TO')
+                constraint.target = empty
+                constraint.track_axis = 'TRACK_NEGATIVE_Z'
+                constraint.up_axis = 'UP_Y'
+    
+    def fill_cameras(self, context, cameras, count, suffix):
+        # Add cameras until there are count of them. The new ones share the
+        # first camera's data, so they add no extra camera datablocks.
+        ref = cameras[0]
+        collection = ref.users_collection[0] if ref.users_collection else context.collection
+        cameras = list(cameras)
+        for i in range(len(cameras), count):
+            cam = bpy.data.objects.new(f"{ref.name}_{suffix}", ref.data)
+            collection.objects.link(cam)
+            cameras.append(cam)
+        return cameras
+    
+    def look_at_matrices(self, cameras, positions, target):
+        # World matrices at positions, each camera facing target
+        target = Vector(target)
+        matrices = []
+        for cam, co in zip(cameras, positions):
+            co = Vector(co)
+            rotation = (target - co).to_track_quat('-Z', 'Y')
+            matrices.append(Matrix.LocRotScale(co, rotation, cam.matrix_world.to_scale()))
+        return matrices
+    
+    def create_linear_path(self, context, cameras):
+        # Visit the cameras in a short order instead of zigzagging
+        points = [tuple(cam.matrix_world.translation) for cam in cameras]
+        order = order_points(points)
+        points = [points[i] for i in order]
+        center = centroid(points)
         
         # Create empty as path parent
-        bpy.ops.object.empty_add(type='PLAIN_AXES')
-        path_empty = context.active_object
-        path_empty.name = "CameraPath"
+        path_empty = self.create_empty(context, "CameraPath", center)
         
-        # Create curve path
+        # Create curve path, in the space of the empty
         curve_data = bpy.data.curves.new(name="CameraPath", type='CURVE')
         curve_data.dimensions = '3D'
         
-        # Create spline
+        local = [tuple(co[axis] - center[axis] for axis in range(3)) for co in points]
+        knots, _ = path_knots('BEZIER', local)
         spline = curve_data.splines.new(type='BEZIER')
-        spline.bezier_points.add(len(cameras) - 1)
-        
-        # Set points from camera positions
-        for i, cam in enumerate(cameras):
-            point = spline.bezier_points[i]
-            point.co = path_empty.matrix_world.inverted() @ cam.location
-            point.handle_left_type = 'AUTO'
-            point.handle_right_type = 'AUTO'
-            
-            # Parent camera to path
-            cam.parent = path_empty
+        spline.bezier_points.add(len(knots) - 1)
+        for point, (co, left, right) in zip(spline.bezier_points, knots):
+            point.handle_left_type = 'FREE'
+            point.handle_right_type = 'FREE'
+            point.co = co
+            point.handle_left = left
+            point.handle_right = right
         
         # Create curve object
         curve_obj = bpy.data.objects.new("CameraPath", curve_data)
         context.collection.objects.link(curve_obj)
         curve_obj.parent = path_empty
         
+        # Cameras stay where they are
+        self.bind(path_empty, cameras, [cam.matrix_world.copy() for cam in cameras])
         return path_empty
     
-    def create_circular_path(self, context, selected_cameras):
+    def create_circular_path(self, context, cameras):
         props = context.scene.cam_helper_props
         
-        # Calculate center point
-        center = Vector((0, 0, 0))
-        for cam in selected_cameras:
-            center += cam.location
-        center /= len(selected_cameras)
-        
-        # Create empty at center
-        bpy.ops.object.empty_add(type='PLAIN_AXES', location=center)
-        center_empty = context.active_object
-        center_empty.name = "CameraCircle"
-        
-        # Arrange cameras in circle
-        radius = props.orbit_radius
-        angle_step = 2 * math.pi / len(selected_cameras)
-        
-        for i, cam in enumerate(selected_cameras):
-            angle = angle_step * i
-            
-            # Calculate new position
-            x = center.x + radius * math.cos(angle)
-            y = center.y + radius * math.sin(angle)
-            z = cam.location.z
-            
-            cam.location = Vector((x, y, z))
-            
-            # Point camera to center
-            direction = center - cam.location
-            rot_quat = direction.to_track_quat('-Z', 'Y')
-            cam.rotation_euler = rot_quat.to_euler()
-            
-            # Parent to center empty
-            cam.parent = center_empty
+        # Circle around the centre of the cameras, each camera keeps its height
+        points = [tuple(cam.matrix_world.translation) for cam in cameras]
+        center = centroid(points)
+        positions = circle_positions(center, props.orbit_radius, [co[2] for co in points])
         
+        center_empty = self.create_empty(context, "CameraCircle", center)
+        self.bind(center_empty, cameras, self.look_at_matrices(cameras, positions, center))
+        self.make_live(context, center_empty, cameras, "radius", props.orbit_radius,
+                       live_terms(center, positions, props.orbit_radius, flat=True))
         return center_empty
     
-    def create_array(self, context, selected_cameras):
+    def create_array(self, context, cameras):
         props = context.scene.cam_helper_props
         
-        # Create empty as array parent
-        bpy.ops.object.empty_add(type='PLAIN_AXES')
-        array_empty = context.active_object
-        array_empty.name = "CameraArray"
-        
-        # Get reference camera (first selected)
-        if not selected_cameras:
-            self.report({'ERROR'}, "No cameras selected")
-            return None
-            
-        ref_cam = selected_cameras[0]
-        spacing = props.binding_distance
-        
-        # Calculate array direction based on reference camera's forward direction
-        forward = ref_cam.matrix_world.to_quaternion() @ Vector((0.0, 0.0, -1.0))
+        ref = cameras[0]
+        cameras = self.fill_cameras(context, cameras, props.array_count, "Array")
+        count = len(cameras)
         
-        # Position cameras in array
-        for i, cam in enumerate(selected_cameras):
-            # Calculate new position
-            offset = forward * (spacing * i)
-            cam.location = ref_cam.location + offset
-            
-            # Match rotation to reference camera
-            cam.rotation_euler = ref_cam.rotation_euler
-            
-            # Parent to array empty
-            cam.parent = array_empty
+        # Grid on the reference camera's axes, all facing the same way as
+        # the reference. A line runs along the view direction, grids across it.
+        ref_matrix = ref.matrix_world.copy()
+        ref_location = ref_matrix.translation.copy()
+        ref_rotation = ref_matrix.to_quaternion()
+        right = ref_rotation @ Vector((1.0, 0.0, 0.0))
+        up = ref_rotation @ Vector((0.0, 1.0, 0.0))
+        forward = ref_rotation @ Vector((0.0, 0.0, -1.0))
+        axes = {'1D': (forward,), '2D': (right, up), '3D': (right, up, forward)}[props.array_layout]
+        shape = grid_shape(count, len(axes))
+        positions = grid_positions(ref_location, axes, props.binding_distance, shape, count)
         
+        array_empty = self.create_empty(context, "CameraArray", ref_location)
+        scale = ref_matrix.to_scale()
+        matrices = [Matrix.LocRotScale(Vector(co), ref_rotation, scale) for co in positions]
+        self.bind(array_empty, cameras, matrices)
+        self.make_live(context, array_empty, cameras, "spacing", props.binding_distance,
+                       live_terms(tuple(ref_location), positions, props.binding_distance), track=False)
         return array_empty
 
-    def create_orbit(self, context, selected_cameras):
+    def create_orbit(self, context, cameras):
         props = context.scene.cam_helper_props
         
-        if not selected_cameras:
-            self.report({'ERROR'}, "No cameras selected")
-            return None
+        # Orbit around the 3D cursor, each camera keeps its height
+        center = tuple(context.scene.cursor.location)
+        heights = [cam.matrix_world.translation.z for cam in cameras]
+        positions = circle_positions(center, props.orbit_radius, heights)
         
-        # Create empty as orbit center
-        bpy.ops.object.empty_add(type='PLAIN_AXES')
-        orbit_empty = context.active_object
-        orbit_empty.name = "CameraOrbit"
+        orbit_empty = self.create_empty(context, "CameraOrbit", center)
+        self.bind(orbit_empty, cameras, self.look_at_matrices(cameras, positions, center))
+        self.make_live(context, orbit_empty, cameras, "radius", props.orbit_radius,
+                       live_terms(center, positions, props.orbit_radius, flat=True))
+        return orbit_empty
+
+    def create_dome(self, context, cameras):
+        props = context.scene.cam_helper_props
         
-        # Calculate orbit parameters
-        radius = props.orbit_radius
-        angle_step = 2 * math.pi / len(selected_cameras)
+        cameras = self.fill_cameras(context, cameras, props.dome_count, "Dome")
         
-        # Position cameras in orbit
-        for i, cam in enumerate(selected_cameras):
-            angle = angle_step * i
-            
-            # Calculate position on orbit
-            x = radius * math.cos(angle)
-            y = radius * math.sin(angle)
-            z = cam.location.z
-            
-            cam.location = orbit_empty.location + Vector((x, y, z))
-            
-            # Point camera to center
-            cam.rotation_mode = 'QUATERNION'
-            direction = orbit_empty.location - cam.location
-            cam.rotation_quaternion = direction.to_track_quat('-Z', 'Y')
-            
-            # Parent to orbit empty
-            cam.parent = orbit_empty
+        # Fibonacci lattice around the 3D cursor, every camera aimed at it.
+        # The cameras follow when the empty is moved or rotated.
+        center = tuple(context.scene.cursor.location)
+        positions = fibonacci_positions(center, props.orbit_radius, len(cameras),
+                                        props.dome_coverage == 'HEMISPHERE')
         
-        return orbit_empty
+        dome_empty = self.create_empty(context, "CameraDome", center)
+        self.bind(dome_empty, cameras, self.look_at_matrices(cameras, positions, center))
+        self.make_live(context, dome_empty, cameras, "radius", props.orbit_radius,
+                       live_terms(center, positions, props.orbit_radius))
+        return dome_empty
 
     def execute(self, context):
-        # Get selected cameras
-        selected_cameras = [obj for obj in context.selected_objects if obj.type == 'CAMERA']
+        # Get selected cameras, sorted by name to ensure consistent order
+        cameras = sorted((obj for obj in context.selected_objects if obj.type == 'CAMERA'),
+                         key=lambda x: x.name)
         
-        if len(selected_cameras) < 2:
+        props = context.scene.cam_helper_props
+        
+        # Arrays and domes can be grown from a single camera
+        if props.binding_type in {'ARRAY', 'DOME'}:
+            if not cameras:
+                self.report({'ERROR'}, "Please select at least one camera")
+                return {'CANCELLED'}
+        elif len(cameras) < 2:
             self.report({'ERROR'}, "Please select at least two cameras")
             return {'CANCELLED'}
         
-        props = context.scene.cam_helper_props
-        
         # Create appropriate binding based on type
         if props.binding_type == 'LINEAR':
-            result = self.create_linear_path(context, selected_cameras)
+            result = self.create_linear_path(context, cameras)
         elif props.binding_type == 'CIRCULAR':
-            result = self.create_circular_path(context, selected_cameras)
+            result = self.create_circular_path(context, cameras)
         elif props.binding_type == 'ARRAY':
-            result = self.create_array(context, selected_cameras)
+            result = self.create_array(context, cameras)
         elif props.binding_type == 'ORBIT':
-            result = self.create_orbit(context, selected_cameras)
+            result = self.create_orbit(context, cameras)
+        elif props.binding_type == 'DOME':
+            result = self.create_dome(context, cameras)
         
         if result is None:
             return {'CANCELLED'}
         
+        bound = sum(1 for obj in result.children if obj.type == 'CAMERA')
+        self.report({'INFO'}, f"Bound {bound} cameras to {result.name}")
         return {'FINISHED'}
 
 class CAMHELPER_OT_clear_binding(Operator):
+    """Unparent the selected cameras, keeping their placement"""
     bl_idname = "camhelper.clear_binding"
     bl_label = "Clear Binding"
+    bl_options = {'REGISTER', 'UNDO'}
     
     def execute(self, context):
         selected_cameras = [obj for obj in context.selected_objects if obj.type == 'CAMERA']
@@ -822,6 +2850,15 @@ class CAMHELPER_OT_clear_binding(Operator):
                 # Clear parent
                 if cam.parent:
                     matrix_world = cam.matrix_world.copy()
+                    
+                    # Drop the drivers a live binding put on the location
+                    anim = cam.animation_data
+                    if anim:
+                        for fcurve in list(anim.drivers):
+                            targets = [t.id for var in fcurve.driver.variables for t in var.targets]
+                            if fcurve.data_path == "location" and cam.parent in targets:
+                                anim.drivers.remove(fcurve)
+                    
                     cam.parent = None
                     cam.matrix_world = matrix_world
                 
@@ -838,6 +2875,7 @@ class CAMHELPER_OT_clear_binding(Operator):
 class CAMHELPER_OT_create_camera_path(Operator):
     bl_idname = "camhelper.create_path"
     bl_label = "Create Camera Path"
+    bl_options = {'REGISTER', 'UNDO'}
     
     def execute(self, context):
         selected_cameras = [obj for obj in context.selected_objects if obj.type == 'CAMERA']
@@ -845,51 +2883,96 @@ class CAMHELPER_OT_create_camera_path(Operator):
             self.report({'ERROR'}, "Select at least two cameras")
             return {'CANCELLED'}
         
+        camera = context.scene.camera
+        if not camera:
+            self.report({'ERROR'}, "No active camera")
+            return {'CANCELLED'}
+        
         props = context.scene.cam_helper_props
         
         try:
+            # Visit the cameras in a short order instead of zigzagging
+            cameras = sorted(selected_cameras, key=lambda x: x.name)
+            points = [tuple(cam.matrix_world.translation) for cam in cameras]
+            points = [points[i] for i in order_points(points)]
+            knots, cyclic = path_knots(props.path_type, points, props.orbit_radius)
+            
             # Create curve
             curve_data = bpy.data.curves.new('CameraPath', type='CURVE')
             curve_data.dimensions = '3D'
             
-            # Create spline
+            # Create spline with the exact handles the path is evaluated with
             spline = curve_data.splines.new(type='BEZIER')
-            spline.bezier_points.add(len(selected_cameras) - 1)
-            
-            # Set points from camera positions
-            for i, cam in enumerate(selected_cameras):
-                point = spline.bezier_points[i]
-                point.co = cam.location
-                point.handle_left_type = 'AUTO'
-                point.handle_right_type = 'AUTO'
+            spline.bezier_points.add(len(knots) - 1)
+            spline.use_cyclic_u = cyclic
+            for point, (co, left, right) in zip(spline.bezier_points, knots):
+                point.handle_left_type = 'FREE'
+                point.handle_right_type = 'FREE'
+                point.co = co
+                point.handle_left = left
+                point.handle_right = right
             
             # Create curve object
             curve_obj = bpy.data.objects.new('CameraPath', curve_data)
             context.collection.objects.link(curve_obj)
             
-            # Create follow path constraint
-            constraint = context.scene.camera.constraints.new(type='FOLLOW_PATH')
-            constraint.target = curve_obj
-            constraint.use_fixed_location = True
-            constraint.forward_axis = 'FORWARD_Y'
-            constraint.up_axis = 'UP_Z'
+            frame_start = context.scene.frame_start
+            frame_end = frame_start + props.path_frames
             
-            # Animate path
-            curve_obj.data.path_duration = props.path_frames
-            curve_obj.data.use_path = True
-            
-            # Add keyframes
-            constraint.offset = 0.0
-            constraint.keyframe_insert(data_path="offset", frame=context.scene.frame_start)
-            constraint.offset = 1.0
-            constraint.keyframe_insert(data_path="offset", frame=context.scene.frame_start + props.path_frames)
+            variation = 0.0
+            if props.path_bake == 'OFFSET':
+                self.bake_offset(camera, curve_obj, props, frame_start, frame_end)
+            else:
+                variation = self.bake_transforms(camera, path_segments(knots, cyclic), props, frame_start, frame_end)
             
-            self.report({'INFO'}, "Camera path created")
+            if variation > PATH_SPEED_LIMIT:
+                self.report({'WARNING'}, f"Camera path created, speed varies by {variation:.1%}")
+            else:
+                self.report({'INFO'}, "Camera path created")
             return {'FINISHED'}
             
         except Exception as e:
             self.report({'ERROR'}, f"Error creating path: {str(e)}")
             return {'CANCELLED'}
+    
+    def bake_offset(self, camera, curve_obj, props, frame_start, frame_end):
+        # Create follow path constraint
+        constraint = camera.constraints.new(type='FOLLOW_PATH')
+        constraint.target = curve_obj
+        constraint.use_fixed_location = True
+        constraint.forward_axis = 'FORWARD_Y'
+        constraint.up_axis = 'UP_Z'
+        
+        # Animate path
+        curve_obj.data.path_duration = props.path_frames
+        curve_obj.data.use_path = True
+        
+        # With a fixed location the constraint places the camera by arc length
+        # along the curve, so two offset factor keys are enough. Linear keys
+        # give constant speed, the default Bezier keys ease in and out.
+        fcurve = ensure_fcurve(camera, f'constraints["{constraint.name}"].offset_factor', 0)
+        add_fcurve_keys(fcurve, (frame_start, 0.0, frame_end, 1.0))
+        for point in fcurve.keyframe_points:
+            point.interpolation = 'LINEAR' if props.path_easing == 'CONSTANT' else 'BEZIER'
+    
+    def bake_transforms(self, camera, segments, props, frame_start, frame_end):
+        # Evaluate the path once per frame through the arc length table, and
+        # return how much a constant speed bake still varies in speed
+        params = sample_params(segments, frame_end - frame_start + 1, props.path_easing)
+        positions = [path_point(segments, param) for param in params]
+        
+        # Keys are in the parent's space when the camera is parented
+        if camera.parent:
+            to_local = (camera.parent.matrix_world @ camera.matrix_parent_inverse).inverted()
+            positions = [tuple(to_local @ Vector(co)) for co in positions]
+        
+        for axis in range(3):
+            fcurve = ensure_fcurve(camera, "location", axis)
+            write_fcurve_keys(fcurve, frame_start, [co[axis] for co in positions])
+        
+        if props.path_easing != 'CONSTANT':
+            return 0.0
+        return speed_variation(segments, params)
 
 class CAMHELPER_OT_dolly_zoom(Operator):
     bl_idname = "camhelper.dolly_zoom"
@@ -978,6 +3061,7 @@ class CAMHELPER_OT_add_camera(Operator):
         item.name = new_cam.name
         item.camera = new_cam
         context.scene.camera_list_index = len(context.scene.camera_list) - 1
+        forget_scene_cameras(context.scene)
         return {'FINISHED'}
 
 class CAMHELPER_OT_remove_camera(Operator):
@@ -995,6 +3079,7 @@ class CAMHELPER_OT_remove_camera(Operator):
                 bpy.data.objects.remove(item.camera, do_unlink=True)
             scene.camera_list.remove(idx)
             scene.camera_list_index = min(idx, len(scene.camera_list) - 1)
+            forget_scene_cameras(scene)
             
         return {'FINISHED'}
 		
@@ -1189,23 +3274,144 @@ class CAMHELPER_OT_lock_to_cursor(Operator):
 class CAMHELPER_UL_camera_list(UIList):
     def draw_item(self, context, layout, data, item, icon, active_data, active_propname):
         if self.layout_type in {'DEFAULT', 'COMPACT'}:
-            layout.prop(item, "name", text="", emboss=False, icon='CAMERA_DATA')
+            # Editing the name renames the camera itself
+            layout.prop(item.camera or item, "name", text="", emboss=False, icon='CAMERA_DATA')
         elif self.layout_type in {'GRID'}:
             layout.alignment = 'CENTER'
             layout.label(text="", icon='CAMERA_DATA')
 
 				
-def update_camera_list(self, context):
-    # Get the camera list property
-    camera_list = context.scene.cam_helper_props.camera_list
-    # Clear existing items
-    camera_list.clear()
-    
-    # Add all cameras to the list
-    for obj in bpy.data.objects:
-        if obj.type == 'CAMERA':
+# Camera registry: scene.camera_list follows the scene's cameras on its own.
+# Depsgraph updates report added cameras and collection changes, and a
+# message bus subscription reports renames, so the usual update only looks
+# at the entries already in the list. The scene is scanned in full only when
+# collections change, when a scene is first seen and on refresh.
+
+# Owner of the message bus subscriptions
+_msgbus_owner = object()
+# Pointers of the scenes whose list has been fully synced since load
+_synced_scenes = set()
+# Cameras of each scene by scene pointer, with the set of their pointers, so
+# panels and draw handlers do not scan every object on each redraw. Dropped
+# whenever a camera is added or deleted or a collection changes.
+_camera_index = {}
+
+def scene_cameras(scene):
+    # Camera objects linked to scene
+    key = scene.as_pointer()
+    entry = _camera_index.get(key)
+    if entry is None:
+        cameras = [obj for obj in scene.objects if obj.type == 'CAMERA']
+        entry = (cameras, {obj.as_pointer() for obj in cameras})
+        _camera_index[key] = entry
+    return entry[0]
+
+def forget_scene_cameras(scene):
+    # The scene's cameras changed, scan again on next use
+    _camera_index.pop(scene.as_pointer(), None)
+    _camera_overlay.invalidate()
+
+def sync_camera_list(scene, added=(), full=False):
+    # Update scene.camera_list in place, touching only entries that changed.
+    # added are cameras known to be in the scene; full rescans the scene to
+    # find cameras that were linked or unlinked.
+    camera_list = scene.camera_list
+    if full:
+        cameras = {obj.as_pointer(): obj for obj in scene.objects if obj.type == 'CAMERA'}
+        added = cameras.values()
+    
+    # Drop cameras that were deleted, or unlinked from the scene
+    changed = False
+    for i in reversed(range(len(camera_list))):
+        cam = camera_list[i].camera
+        if cam is None or (full and cam.as_pointer() not in cameras):
+            camera_list.remove(i)
+            changed = True
+    
+    known = {item.camera.as_pointer() for item in camera_list}
+    for obj in added:
+        if obj.as_pointer() not in known:
             item = camera_list.add()
-            item.name = obj.name				
+            item.name = obj.name
+            item.camera = obj
+            known.add(obj.as_pointer())
+            changed = True
+    
+    # Follow renames
+    for item in camera_list:
+        if item.name != item.camera.name:
+            item.name = item.camera.name
+    
+    if changed and scene.camera_list_index >= len(camera_list):
+        scene.camera_list_index = len(camera_list) - 1
+    return changed
+
+@persistent
+def camera_registry_update(scene, depsgraph):
+    full = scene.as_pointer() not in _synced_scenes
+    relinked = full
+    moved = False
+    added = []
+    for update in depsgraph.updates:
+        obj = update.id.original
+        if isinstance(obj, bpy.types.Object):
+            # Cameras follow their parents, so any object may move one
+            moved = True
+            if obj.type == 'CAMERA':
+                added.append(obj)
+        elif isinstance(obj, bpy.types.Collection):
+            # Objects were linked or unlinked
+            full = relinked = True
+    deleted = any(item.camera is None for item in scene.camera_list)
+    if moved or relinked or deleted:
+        _camera_overlay.invalidate()
+    
+    # The cached cameras go stale on any add or delete, even when the list
+    # itself was already up to date
+    entry = _camera_index.get(scene.as_pointer())
+    if entry is not None and (relinked or deleted or
+            any(obj.as_pointer() not in entry[1] for obj in added)):
+        forget_scene_cameras(scene)
+    
+    # Writing the list updates the depsgraph again, so only write when
+    # something is actually different
+    if full or added or deleted:
+        sync_camera_list(scene, added, full)
+        _synced_scenes.add(scene.as_pointer())
+
+@persistent
+def camera_registry_frame(scene, *args):
+    # Animated cameras move on frame changes, which send no depsgraph update
+    _camera_overlay.invalidate()
+
+def camera_names_changed():
+    _camera_overlay.invalidate()
+    scene = bpy.context.scene
+    if scene:
+        sync_camera_list(scene)
+
+def subscribe_camera_names():
+    bpy.msgbus.subscribe_rna(
+        key=(bpy.types.Object, "name"),
+        owner=_msgbus_owner,
+        args=(),
+        notify=camera_names_changed
+    )
+
+@persistent
+def camera_registry_load(dummy):
+    # Loading a file drops message bus subscriptions and scene pointers
+    _synced_scenes.clear()
+    _camera_index.clear()
+    _camera_overlay.clear()
+    subscribe_camera_names()
+
+@persistent
+def camera_registry_undo(dummy):
+    # Undo and redo rebuild the data, cached objects are no longer valid
+    _synced_scenes.clear()
+    _camera_index.clear()
+    _camera_overlay.invalidate()
 				
 class CAMHELPER_OT_smooth_camera_transition(Operator):
     bl_idname = "camhelper.smooth_transition"
@@ -1267,65 +3473,260 @@ class CAMHELPER_OT_set_transition_duration(Operator):
         return {'FINISHED'} 
 				
 # Camera Marker Drawing
+# Camera markers: frustum corners in camera space, scaled by the display
+# size, and the corner pairs joined by lines
+CAMERA_MARKER_CORNERS = ((-1.0, -1.0, -1.0), (1.0, -1.0, -1.0), (1.0, 1.0, -1.0), (-1.0, 1.0, -1.0), (0.0, 0.0, 1.0))
+CAMERA_MARKER_EDGES = (0, 1, 1, 2, 2, 3, 3, 0, 0, 4, 1, 4, 2, 4, 3, 4)
+CAMERA_MARKER_COLOR = (1.0, 1.0, 1.0, 1.0)
+
+def camera_marker_lines(matrices, size):
+    # LINES vertices of every camera marker, from 4x4 world matrices given as
+    # Matrix objects, nested sequences or an (n, 4, 4) array. Needs no GPU.
+    if np is not None:
+        matrices = np.asarray(matrices, dtype=np.float64).reshape(-1, 4, 4)
+        corners = np.hstack((np.asarray(CAMERA_MARKER_CORNERS) * size, np.ones((len(CAMERA_MARKER_CORNERS), 1))))
+        world = np.einsum('nij,kj->nki', matrices, corners)[:, :, :3]
+        return world[:, CAMERA_MARKER_EDGES].reshape(-1, 3).astype(np.float32)
+    
+    coords = []
+    for matrix in matrices:
+        rows = [tuple(matrix[i]) for i in range(3)]
+        world = [tuple(row[0] * x * size + row[1] * y * size + row[2] * z * size + row[3] for row in rows)
+                 for x, y, z in CAMERA_MARKER_CORNERS]
+        coords.extend(world[i] for i in CAMERA_MARKER_EDGES)
+    return coords
+
+class CameraMarkerBatch:
+    """One LINES batch for every camera marker, rebuilt only when it changes"""
+    
+    def __init__(self):
+        self.key = None
+        self.batch = None
+        self.shader = None
+        
+    def clear(self):
+        self.__init__()
+        
+    def draw(self, cameras, size, key):
+        # key changes whenever the cameras or their matrices may have, so
+        # the cameras are only visited when the batch is rebuilt
+        if self.shader is None:
+            self.shader = uniform_color_shader_3d()
+        
+        key = (size, key)
+        if key != self.key:
+            matrices = [cam.matrix_world for cam in cameras]
+            self.batch = batch_for_shader(self.shader, 'LINES', {"pos": camera_marker_lines(matrices, size)})
+            self.key = key
+        
+        self.shader.bind()
+        self.shader.uniform_float("color", CAMERA_MARKER_COLOR)
+        self.batch.draw(self.shader)
+
 def draw_camera_markers():
     context = bpy.context
     props = context.scene.cam_helper_props
     
-    if not props.show_camera_names:
+    if not props.show_camera_names or context.region_data is None:
         return
         
-    # Get all cameras in scene
-    cameras = [obj for obj in bpy.data.objects if obj.type == 'CAMERA']
+    # Get all cameras in scene, and draw those not merged into a cluster
+    cameras = scene_cameras(context.scene)
+    if cameras:
+        overlay = _camera_overlay.region_state(context, cameras)
+        if overlay.singles:
+            overlay.markers.draw([cameras[i] for i in overlay.singles], props.camera_display_size, overlay.key)
+
+# Camera name labels: size in points before UI scaling, color, and the pixel
+# offset from the projected camera position
+CAMERA_LABEL_SIZE = 11
+CAMERA_LABEL_COLOR = (1.0, 1.0, 1.0, 0.9)
+CAMERA_LABEL_OFFSET = (8.0, 4.0)
+# Pixels a label may start outside the region and still be drawn
+CAMERA_LABEL_MARGIN = 64.0
+
+def project_points(points, perspective_matrix, width, height, margin=0.0):
+    # Region pixel positions of world space points through a 4x4 view
+    # projection matrix, as (indices, positions) of the points in front of
+    # the view and within margin pixels of the region. Needs no GPU.
+    if np is not None:
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        matrix = np.asarray(perspective_matrix, dtype=np.float64)
+        clip = points @ matrix[:, :3].T + matrix[:, 3]
+        w = clip[:, 3]
+        front = w > 1e-6
+        w = np.where(front, w, 1.0)
+        x = (clip[:, 0] / w + 1.0) * 0.5 * width
+        y = (clip[:, 1] / w + 1.0) * 0.5 * height
+        visible = front & (x >= -margin) & (x <= width + margin) & (y >= -margin) & (y <= height + margin)
+        indices = np.flatnonzero(visible)
+        return indices, np.column_stack((x[indices], y[indices]))
     
-    shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
-    shader.bind()
+    rows = [tuple(perspective_matrix[i]) for i in range(4)]
+    indices = []
+    positions = []
+    for i, co in enumerate(points):
+        clip = [row[0] * co[0] + row[1] * co[1] + row[2] * co[2] + row[3] for row in rows]
+        if clip[3] <= 1e-6:
+            continue
+        x = (clip[0] / clip[3] + 1.0) * 0.5 * width
+        y = (clip[1] / clip[3] + 1.0) * 0.5 * height
+        if -margin <= x <= width + margin and -margin <= y <= height + margin:
+            indices.append(i)
+            positions.append((x, y))
+    return indices, positions
+
+# Cameras whose labels land in the same cell of this many pixels (before UI
+# scaling) are drawn as one cluster glyph with a count
+CLUSTER_CELL_SIZE = 48
+# Half size in pixels of the cluster glyph
+CLUSTER_GLYPH_SIZE = 6.0
+CLUSTER_COLOR = (1.0, 0.8, 0.2, 0.9)
+
+def cluster_points(positions, cell_size):
+    # Group 2D positions by grid cell, returning one list of point indices
+    # per occupied cell, in order of first appearance
+    if np is not None and len(positions):
+        cells = np.floor(np.asarray(positions, dtype=np.float64) / cell_size).astype(np.int64)
+        _, first, inverse = np.unique(cells, axis=0, return_index=True, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        order = np.argsort(inverse, kind='stable')
+        groups = np.split(order, np.cumsum(np.bincount(inverse))[:-1])
+        return [groups[i].tolist() for i in np.argsort(first)]
     
-    for cam in cameras:
-        # Draw camera icon
-        matrix = cam.matrix_world
-        size = props.camera_display_size
-        
-        # Camera frustum vertices
-        verts = [
-            matrix @ Vector((-size, -size, -size)),
-            matrix @ Vector((size, -size, -size)),
-            matrix @ Vector((size, size, -size)),
-            matrix @ Vector((-size, size, -size)),
-            matrix @ Vector((0, 0, size))
-        ]
+    cells = {}
+    for i, (x, y) in enumerate(positions):
+        cells.setdefault((math.floor(x / cell_size), math.floor(y / cell_size)), []).append(i)
+    return list(cells.values())
+
+class CameraOverlayRegion:
+    """Projected, clustered cameras of one 3D view region"""
+    
+    def __init__(self):
+        self.key = None
+        # Camera indices drawn in full, with their labels
+        self.singles = []
+        self.labels = []
+        # (count, x, y) of every cluster glyph
+        self.clusters = []
+        self.glyphs = None
+        self.markers = CameraMarkerBatch()
+
+class CameraOverlay:
+    """Overlay state of each 3D view region, kept while nothing moves"""
+    
+    def __init__(self):
+        self._regions = {}
+        # Bumped by the camera registry whenever a camera may have been
+        # added, removed, renamed or moved
+        self.generation = 0
         
-        # Draw lines
-        shader.uniform_float("color", (1, 1, 1, 1))
-        batch = batch_for_shader(shader, 'LINES', {
-            "pos": verts
-        })
-        batch.draw(shader)
+    def clear(self):
+        self._regions.clear()
+        self.generation += 1
         
-        # Draw name
-        if props.show_camera_names:
-            view3d_utils.location_3d_to_region_2d(
-                context.region, 
-                context.space_data.region_3d,
-                cam.location
-            )
+    def invalidate(self):
+        self.generation += 1
+        
+    def region_state(self, context, cameras):
+        region = context.region
+        perspective = context.region_data.perspective_matrix
+        props = context.scene.cam_helper_props
+        cell_size = CLUSTER_CELL_SIZE * context.preferences.system.ui_scale if props.cluster_cameras else 0.0
+        
+        # Nothing here visits the cameras, so an unchanged redraw costs the
+        # same however many there are
+        key = (
+            tuple(v for row in perspective for v in row),
+            region.width,
+            region.height,
+            cell_size,
+            context.scene.as_pointer(),
+            self.generation
+        )
+        state = self._regions.setdefault(region.as_pointer(), CameraOverlayRegion())
+        if state.key == key:
+            return state
+        
+        points = [tuple(cam.matrix_world.translation) for cam in cameras]
+        # Project once, cull off-screen cameras and merge the ones that
+        # crowd the same cell. The work left per redraw is bounded by the
+        # number of cells, not the number of cameras.
+        indices, positions = project_points(points, perspective, region.width, region.height,
+                                            CAMERA_LABEL_MARGIN)
+        positions = [(float(x), float(y)) for x, y in positions]
+        groups = cluster_points(positions, cell_size) if cell_size else [[i] for i in range(len(positions))]
+        
+        singles = [group[0] for group in groups if len(group) == 1]
+        state.singles = [int(indices[j]) for j in singles]
+        state.labels = [(cameras[int(indices[j])].name,) + positions[j] for j in singles]
+        state.clusters = [(len(group),
+                           sum(positions[i][0] for i in group) / len(group),
+                           sum(positions[i][1] for i in group) / len(group))
+                          for group in groups if len(group) > 1]
+        state.glyphs = None
+        state.key = key
+        return state
+
+_camera_overlay = CameraOverlay()
+
+def draw_camera_labels():
+    context = bpy.context
+    props = context.scene.cam_helper_props
+    region_3d = context.region_data
+    
+    if not props.show_camera_names or region_3d is None:
+        return
+    
+    cameras = scene_cameras(context.scene)
+    if not cameras:
+        return
+    overlay = _camera_overlay.region_state(context, cameras)
+    
+    # Cluster glyphs, as one batch of squares
+    if overlay.clusters:
+        shader = uniform_color_shader_2d()
+        if overlay.glyphs is None:
+            r = CLUSTER_GLYPH_SIZE
+            corners = ((-r, -r), (r, -r), (r, r), (-r, r))
+            coords = [(x + corners[i % 4][0], y + corners[i % 4][1])
+                      for _, x, y in overlay.clusters
+                      for edge in range(4) for i in (edge, edge + 1)]
+            overlay.glyphs = batch_for_shader(shader, 'LINES', {"pos": coords})
+        gpu.state.blend_set('ALPHA')
+        shader.bind()
+        shader.uniform_float("color", CLUSTER_COLOR)
+        overlay.glyphs.draw(shader)
+        gpu.state.blend_set('NONE')
+    
+    font_id = 0
+    size = CAMERA_LABEL_SIZE * context.preferences.system.ui_scale
+    try:
+        blf.size(font_id, size)
+    except TypeError:
+        # Blender before 3.4 also wants the dpi
+        blf.size(font_id, int(size), 72)
+    
+    dx, dy = CAMERA_LABEL_OFFSET
+    blf.color(font_id, *CAMERA_LABEL_COLOR)
+    for name, x, y in overlay.labels:
+        blf.position(font_id, x + dx, y + dy, 0)
+        blf.draw(font_id, name)
+    
+    blf.color(font_id, *CLUSTER_COLOR)
+    for count, x, y in overlay.clusters:
+        blf.position(font_id, x + dx, y + dy, 0)
+        blf.draw(font_id, str(count))
 
 class CAMHELPER_OT_refresh_camera_list(Operator):
     bl_idname = "camhelper.refresh_camera_list"
     bl_label = "Refresh Camera List"
     
     def execute(self, context):
-        scene = context.scene
-        cam_helper_props = scene.cam_helper_props
-        
-        # Clear existing list
-        cam_helper_props.camera_list.clear()
-        
-        # Add all cameras in the scene
-        for obj in bpy.data.objects:
-            if obj.type == 'CAMERA':
-                item = cam_helper_props.camera_list.add()
-                item.name = obj.name
-        
+        # The list keeps itself up to date, this only forces a full rescan
+        sync_camera_list(context.scene, full=True)
+        _synced_scenes.add(context.scene.as_pointer())
+        forget_scene_cameras(context.scene)
         return {'FINISHED'}
 
 class CAMHELPER_OT_select_camera(Operator):
@@ -1374,6 +3775,7 @@ class CAMHELPER_PT_camera_list(Panel):
         col = row.column(align=True)
         col.operator("camhelper.add_camera", icon='ADD', text="")
         col.operator("camhelper.remove_camera", icon='REMOVE', text="")
+        col.operator("camhelper.refresh_camera_list", icon='FILE_REFRESH', text="")
         
         # Active camera operations
         if len(scene.camera_list) > 0 and scene.camera_list_index >= 0:
@@ -1445,9 +3847,23 @@ class CAMHELPER_PT_animation_panel(Panel):
         row.prop(props, "enable_camera_shake")
         
         if props.enable_camera_shake:
+            effects = context.scene.camera_effects
+            row = box.row()
+            row.prop(effects, "shake_target")
+            row = box.row()
+            row.prop(effects, "shake_mode", expand=True)
+            if effects.shake_mode == 'KEYS':
+                row = box.row()
+                row.prop(effects, "shake_noise_type")
+            row = box.row(align=True)
+            row.prop(effects, "shake_amplitude")
+            row.prop(effects, "shake_frequency")
             row = box.row(align=True)
-            row.prop(props, "shake_strength")
-            row.prop(props, "shake_frequency")
+            row.prop(effects, "shake_rotation")
+            row.prop(effects, "shake_decay")
+            row = box.row(align=True)
+            row.prop(effects, "shake_seed")
+            row.prop(effects, "shake_octaves")
             
             row = box.row(align=True)
             row.operator("camhelper.add_shake")
@@ -1474,19 +3890,64 @@ class CAMHELPER_PT_multicam_panel(Panel):
         row.prop(props, "active_camera_group")
         row.operator("camhelper.create_camera_group", text="", icon='GROUP')
         
+        # Camera Binding
+        box = layout.box()
+        box.label(text="Camera Binding")
+        
+        row = box.row()
+        row.prop(props, "binding_type")
+        
+        if props.binding_type == 'ARRAY':
+            row = box.row(align=True)
+            row.prop(props, "array_layout", text="")
+            row.prop(props, "array_count")
+            row = box.row()
+            row.prop(props, "binding_distance")
+        elif props.binding_type in {'CIRCULAR', 'ORBIT'}:
+            row = box.row()
+            row.prop(props, "orbit_radius")
+        elif props.binding_type == 'DOME':
+            row = box.row(align=True)
+            row.prop(props, "dome_coverage", text="")
+            row.prop(props, "dome_count")
+            row = box.row()
+            row.prop(props, "orbit_radius")
+        
+        if props.binding_type != 'LINEAR':
+            row = box.row()
+            row.prop(props, "live_binding")
+        
+        row = box.row(align=True)
+        row.operator("camhelper.bind_cameras", icon='LINKED')
+        row.operator("camhelper.clear_binding", icon='UNLINKED')
+        
+        # Controls of the live binding under the active empty
+        rig = context.active_object
+        if rig and BINDING_PROPERTY in rig and rig[BINDING_PROPERTY] in rig:
+            row = box.row()
+            row.label(text=rig.name, icon='EMPTY_AXIS')
+            row.prop(rig, f'["{rig[BINDING_PROPERTY]}"]', text=rig[BINDING_PROPERTY].title())
+        
+        # Viewport Overlay
+        box = layout.box()
+        box.label(text="Viewport Overlay")
+        
+        row = box.row()
+        row.prop(props, "show_camera_names")
+        row.prop(props, "cluster_cameras")
+        
         # Camera List
         box = layout.box()
         box.label(text="Scene Cameras")
         
-        for obj in bpy.data.objects:
-            if obj.type == 'CAMERA':
-                row = box.row(align=True)
-                row.label(text=obj.name, icon='CAMERA_DATA')
-                row.operator(
-                    "camhelper.smooth_transition",
-                    text="",
-                    icon='VIEW_CAMERA'
-                ).target_camera = obj.name
+        for obj in scene_cameras(context.scene):
+            row = box.row(align=True)
+            row.label(text=obj.name, icon='CAMERA_DATA')
+            row.operator(
+                "camhelper.smooth_transition",
+                text="",
+                icon='VIEW_CAMERA'
+            ).target_camera = obj.name
 
 # UI Panels
 class CAMHELPER_PT_main_panel(Panel):
@@ -1630,8 +4091,40 @@ class BEATANALYZER_PT_panel(Panel):
         # Analysis settings
         box = layout.box()
         box.label(text="Analysis Settings", icon='SETTINGS')
+        box.prop(props, "detection_mode")
+        box.prop(props, "downmix_mode")
+        use_flux = props.detection_mode == 'SPECTRAL_FLUX' or props.marker_mode != 'ONSETS' or selected_bands(props)
+        if analysis_downmix(props.downmix_mode, use_flux) != props.downmix_mode:
+            box.label(text="RMS is for amplitude onsets, using Mean", icon='INFO')
         box.prop(props, "chunk_size")
         box.prop(props, "threshold")
+        box.prop(props, "use_cache")
+        
+        # Threshold preview of the last analysis
+        box.prop(props, "show_preview")
+        preview = current_beat_preview(props)
+        if preview is not None:
+            box.label(text=f"Preview: {len(preview.beat_frames)} beats at this threshold", icon='MARKER_HLT')
+        elif props.show_preview:
+            box.label(text="Analyze to preview the threshold", icon='INFO')
+        
+        # Band settings
+        box.prop(props, "use_bands")
+        if props.use_bands:
+            row = box.row(align=True)
+            row.prop(props, "analysis_bands", expand=True)
+        
+        # Beat grid settings
+        box = layout.box()
+        box.label(text="Beat Grid", icon='TIME')
+        box.prop(props, "marker_mode")
+        if props.marker_mode != 'ONSETS':
+            box.prop(props, "beats_per_bar")
+            row = box.row(align=True)
+            row.prop(props, "min_bpm")
+            row.prop(props, "max_bpm")
+            if props.estimated_bpm > 0.0:
+                box.label(text=f"Estimated Tempo: {props.estimated_bpm:.1f} BPM")
         
         # Marker settings
         box = layout.box()
@@ -1640,10 +4133,20 @@ class BEATANALYZER_PT_panel(Panel):
         box.prop(props, "marker_color")
         box.prop(props, "clear_existing")
         
-        # Analyze button
-        row = layout.row()
-        row.scale_y = 2.0
-        row.operator("beatanalyzer.analyze_audio", icon='PLAY')
+        # Analyze button, or progress while an analysis is running
+        if BEATANALYZER_OT_analyze_audio._running:
+            box = layout.box()
+            row = box.row()
+            row.enabled = False
+            row.prop(props, "analysis_progress", text="Analyzing", slider=True)
+            box.label(text="Press Esc to cancel", icon='CANCEL')
+        else:
+            row = layout.row()
+            row.scale_y = 2.0
+            row.operator("beatanalyzer.analyze_audio", icon='PLAY')
+
+# (space type, handle) of every draw handler added in register()
+_draw_handlers = []
 
 def register():
     # Register property groups first
@@ -1651,6 +4154,7 @@ def register():
     bpy.utils.register_class(CameraListProperties)
     bpy.utils.register_class(CameraListItem)
     bpy.utils.register_class(CamHelperProperties)
+    bpy.utils.register_class(CameraEffectsProperties)
     bpy.utils.register_class(BeatAnalyzerProperties)
     
     # Register UI classes
@@ -1677,39 +4181,78 @@ def register():
     bpy.utils.register_class(CAMHELPER_OT_smooth_camera_transition)
     bpy.utils.register_class(CAMHELPER_OT_enable_passepartout)
     bpy.utils.register_class(CAMHELPER_OT_create_camera_path)
+    bpy.utils.register_class(CAMHELPER_OT_bind_cameras)
+    bpy.utils.register_class(CAMHELPER_OT_clear_binding)
     bpy.utils.register_class(CAMHELPER_OT_dolly_zoom)
     bpy.utils.register_class(CAMHELPER_OT_add_roll)
     bpy.utils.register_class(CAMHELPER_OT_set_transition_duration)
     bpy.utils.register_class(BEATANALYZER_OT_analyze_audio)
+    bpy.utils.register_class(CAMHELPER_OT_refresh_camera_list)
     
-    # Register draw handler
+    # Keep the camera list in sync with the scene
+    bpy.app.handlers.depsgraph_update_post.append(camera_registry_update)
+    bpy.app.handlers.load_post.append(camera_registry_load)
+    bpy.app.handlers.undo_post.append(camera_registry_undo)
+    bpy.app.handlers.redo_post.append(camera_registry_undo)
+    bpy.app.handlers.frame_change_post.append(camera_registry_frame)
+    subscribe_camera_names()
+    
+    # Register draw handlers
     if not bpy.app.background:
-        bpy.types.SpaceView3D.draw_handler_add(
+        _draw_handlers.append((bpy.types.SpaceView3D, bpy.types.SpaceView3D.draw_handler_add(
             draw_camera_markers, (), 'WINDOW', 'POST_VIEW'
-        )
+        )))
+        _draw_handlers.append((bpy.types.SpaceView3D, bpy.types.SpaceView3D.draw_handler_add(
+            draw_camera_labels, (), 'WINDOW', 'POST_PIXEL'
+        )))
+        _draw_handlers.append((bpy.types.SpaceDopeSheetEditor, bpy.types.SpaceDopeSheetEditor.draw_handler_add(
+            draw_beat_preview, (), 'WINDOW', 'POST_VIEW'
+        )))
     
     # Register properties
     bpy.types.Scene.cam_helper_props = bpy.props.PointerProperty(type=CamHelperProperties)
     bpy.types.Scene.camera_list_props = bpy.props.PointerProperty(type=CameraListProperties)
     bpy.types.Scene.beat_analyzer_props = bpy.props.PointerProperty(type=BeatAnalyzerProperties)
+    bpy.types.Scene.camera_effects = bpy.props.PointerProperty(type=CameraEffectsProperties)
     bpy.types.Scene.camera_list = bpy.props.CollectionProperty(type=CameraListItem)
     bpy.types.Scene.camera_list_index = IntProperty()
     bpy.types.Scene.camera_presets = {}
 
 def unregister():
+    # Remove draw handlers
+    for space, handler in _draw_handlers:
+        space.draw_handler_remove(handler, 'WINDOW')
+    _draw_handlers.clear()
+    _beat_preview.clear()
+    _camera_overlay.clear()
+    
+    # Remove camera registry handlers
+    bpy.app.handlers.depsgraph_update_post.remove(camera_registry_update)
+    bpy.app.handlers.load_post.remove(camera_registry_load)
+    bpy.app.handlers.undo_post.remove(camera_registry_undo)
+    bpy.app.handlers.redo_post.remove(camera_registry_undo)
+    bpy.app.handlers.frame_change_post.remove(camera_registry_frame)
+    bpy.msgbus.clear_by_owner(_msgbus_owner)
+    _synced_scenes.clear()
+    _camera_index.clear()
+    
     # Remove properties
     del bpy.types.Scene.cam_helper_props
     del bpy.types.Scene.camera_list_props
     del bpy.types.Scene.beat_analyzer_props
+    del bpy.types.Scene.camera_effects
     del bpy.types.Scene.camera_list
     del bpy.types.Scene.camera_list_index
     del bpy.types.Scene.camera_presets
     
     # Unregister operators
+    bpy.utils.unregister_class(CAMHELPER_OT_refresh_camera_list)
     bpy.utils.unregister_class(BEATANALYZER_OT_analyze_audio)
     bpy.utils.unregister_class(CAMHELPER_OT_set_transition_duration)
     bpy.utils.unregister_class(CAMHELPER_OT_add_roll)
     bpy.utils.unregister_class(CAMHELPER_OT_dolly_zoom)
+    bpy.utils.unregister_class(CAMHELPER_OT_clear_binding)
+    bpy.utils.unregister_class(CAMHELPER_OT_bind_cameras)
     bpy.utils.unregister_class(CAMHELPER_OT_create_camera_path)
     bpy.utils.unregister_class(CAMHELPER_OT_enable_passepartout)
     bpy.utils.unregister_class(CAMHELPER_OT_smooth_camera_transition)
@@ -1736,6 +4279,7 @@ def unregister():
     
     # Unregister property groups last
     bpy.utils.unregister_class(BeatAnalyzerProperties)
+    bpy.utils.unregister_class(CameraEffectsProperties)
     bpy.utils.unregister_class(CamHelperProperties)
     bpy.utils.unregister_class(CameraListProperties)
     bpy.utils.unregister_class(CameraListItem)